@@ -2,26 +2,164 @@
 # This file is subject to the terms and conditions defined in
 # file 'LICENSE', which is part of this source code package.
 
-import importlib.metadata
+# Submodules are imported on first use, so that "import tuzue" stays
+# cheap for scripts that don't open the UI (which pulls curses):
+SUBMODULES = {
+    "aio",
+    "binput",
+    "cache",
+    "cli",
+    "inspector",
+    "logger",
+    "preview",
+    "query",
+    "reader",
+    "server",
+    "tree",
+    "ui",
+    "view",
+}
 
-import tuzue.inspector
-import tuzue.ui.tcurses
-import tuzue.view
+
+def __getattr__(name):
+    if name in SUBMODULES:
+        import importlib
+
+        return importlib.import_module("tuzue." + name)
+    raise AttributeError("module 'tuzue' has no attribute '%s'" % name)
 
 
 def version():
+    import importlib.metadata
+
     return importlib.metadata.version("tuzue")
 
 
-def navigate(struct, title=""):
-    view = tuzue.view.View(items=struct, title=title)
+def navigate(
+    struct=None,
+    title="",
+    cache_dir=None,
+    cache_key=None,
+    generator=None,
+    max_items=None,
+    max_bytes=None,
+    preview=None,
+    flat=False,
+    rank=None,
+):
+    """
+    Shows a menu with the items in struct, or yielded by generator, and
+    returns the selected one.
+
+    If struct is nested (see tuzue.tree.is_nested), its levels are
+    expanded on demand and the (keys, value) of the selected leaf is
+    returned; with flat, all leaves are shown in a single menu instead,
+    as the tree is walked. flat requires a nested struct, and nested
+    structs only support title, and preview and rank with flat; other
+    combinations raise ValueError.
+
+    max_items and max_bytes bound the memory used by the items; when they
+    are exceeded, the oldest items are dropped. That allows us to follow
+    endless generators, like the lines of a growing log.
+
+    preview is an optional callback that returns the text shown in a
+    preview pane for the selected item; it runs in a worker thread. With
+    flat, it gets the value of the selected leaf.
+
+    With rank, the best rank matches of the query are shown on top of
+    the menu, ahead of the others; it can't be used with max_items or
+    max_bytes, which raises ValueError.
+
+    If cache_dir is provided, the items are persisted there under
+    cache_key, and later calls with the same key load them from disk
+    instead; struct can then be a callable that returns the items, so
+    that they are only built on a cache miss. cache_dir requires cache_key
+    and can't be used with generator; ValueError is raised otherwise.
+    """
+    import tuzue.tree
+    import tuzue.ui.tcurses
+    import tuzue.view
+
+    nested = struct is not None and tuzue.tree.is_nested(struct)
+    if nested:
+        unsupported = {
+            "cache_dir": cache_dir,
+            "cache_key": cache_key,
+            "generator": generator,
+            "max_items": max_items,
+            "max_bytes": max_bytes,
+        }
+        if not flat:
+            unsupported["preview"] = preview
+            unsupported["rank"] = rank
+        for name, value in unsupported.items():
+            if value is not None:
+                raise ValueError("%s can't be used with a nested struct" % name)
+    elif flat:
+        raise ValueError("flat requires a nested struct")
+    if rank and (max_items is not None or max_bytes is not None):
+        raise ValueError("rank can't be used with max_items or max_bytes")
+    if cache_dir is not None:
+        if cache_key is None:
+            raise ValueError("cache_dir requires a cache_key")
+        if generator is not None:
+            raise ValueError("cache_dir can't be used with a generator")
+    # Leaves of the flat tree, by item:
+    entrydict = {}
+    previewer = None
+    if preview is not None:
+        import tuzue.preview
+
+        def leaf_preview(item):
+            return preview(entrydict[item][1])
+
+        previewer = tuzue.preview.Previewer(leaf_preview if nested else preview)
+    if nested:
+        with tuzue.ui.tcurses.context(previewer=previewer) as ui:
+            tree = tuzue.tree.Tree(ui)
+            if flat:
+                return tree.search(struct, title, rank=rank, entrydict=entrydict)
+            return tree.navigate(struct, title)
+    if cache_dir is not None:
+        import tuzue.cache
+
+        struct = tuzue.cache.Cache(cache_dir).items(cache_key, struct)
+    view = tuzue.view.View(
+        items=struct,
+        title=title,
+        generator=generator,
+        max_items=max_items,
+        max_bytes=max_bytes,
+        rank=rank,
+    )
     done = None
-    with tuzue.ui.tcurses.context() as ui:
+    with tuzue.ui.tcurses.context(previewer=previewer) as ui:
         while not done:
             ui.show(view)
             done = ui.interact(view)
     return view.selected_item()
 
 
+async def navigate_async(*args, **kwargs):
+    """navigate for asyncio; see tuzue.aio.navigate"""
+    import tuzue.aio
+
+    return await tuzue.aio.navigate(*args, **kwargs)
+
+
 def inspect(*args, **kwargs):
+    import tuzue.inspector
+
     return tuzue.inspector.inspect(*args, **kwargs)
+
+
+def filter(items, query):
+    import tuzue.query
+
+    return tuzue.query.filter_items(items, query)
+
+
+def filter_batch(items, queries):
+    import tuzue.query
+
+    return tuzue.query.filter_batch(items, queries)
@@ -0,0 +1,10 @@
+# Copyright (C) 2023 Leandro Lisboa Penz <lpenz@lpenz.org>
+# This file is subject to the terms and conditions defined in
+# file 'LICENSE', which is part of this source code package.
+
+import sys
+
+import tuzue.cli
+
+if __name__ == "__main__":
+    sys.exit(tuzue.cli.main())
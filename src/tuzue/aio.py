@@ -0,0 +1,173 @@
+# Copyright (C) 2023 Leandro Lisboa Penz <lpenz@lpenz.org>
+# This file is subject to the terms and conditions defined in
+# file 'LICENSE', which is part of this source code package.
+"""
+asyncio-native navigate, that runs the menu as tasks of the event loop
+instead of owning the thread.
+"""
+
+import asyncio
+import collections
+import signal
+
+import tuzue.preview
+import tuzue.ui.tcurses
+import tuzue.view
+
+# curses reads the keyboard from stdin:
+INPUT_FD = 0
+
+
+class AsyncSource:
+    """
+    Consumes an async iterator in a task and provides its items to a View
+    as an item generator.
+    """
+
+    def __init__(self, aiterable):
+        self.aiterable = aiterable
+        self.items = collections.deque()
+        self.done = False
+        # Set when there are items available, or when we are done:
+        self.ready = asyncio.Event()
+
+    async def run(self):
+        try:
+            async for item in self.aiterable:
+                self.items.append(item)
+                self.ready.set()
+        finally:
+            self.done = True
+            self.ready.set()
+
+    def generator(self):
+        """Item generator for View: yields None when we have to wait"""
+        while self.items or not self.done:
+            if self.items:
+                yield self.items.popleft()
+            else:
+                self.ready.clear()
+                yield None
+
+
+class Navigator:
+    """Drives a View with a curses UI from the event loop"""
+
+    def __init__(self, ui, view, source=None, input_fd=INPUT_FD):
+        self.ui = ui
+        self.view = view
+        self.source = source
+        # Where the keys come from; the fd the ui reads them from:
+        self.input_fd = input_fd
+        self.loop = asyncio.get_running_loop()
+        self.result = self.loop.create_future()
+        self.render_scheduled = False
+        if ui.previewer:
+            ui.previewer.on_ready = self.render_schedule_threadsafe
+
+    def render_schedule_threadsafe(self):
+        self.loop.call_soon_threadsafe(self.render_schedule)
+
+    def render_schedule(self):
+        """Coalesces render requests into a single one per loop iteration"""
+        if not self.render_scheduled:
+            self.render_scheduled = True
+            self.loop.call_soon(self.render)
+
+    def render(self):
+        self.render_scheduled = False
+        if not self.result.done():
+            self.ui.show(self.view)
+
+    def resized(self):
+        self.ui.terminal_resized()
+        self.render_schedule()
+
+    def task_done(self, task):
+        """Makes the navigation fail with the error of a task, if any"""
+        if task.cancelled() or task.exception() is None:
+            return
+        if not self.result.done():
+            self.result.set_exception(task.exception())
+
+    def input_ready(self):
+        keys = self.ui.input_read(0)
+        if self.result.done():
+            return
+        if self.ui.keys_process(self.view, keys):
+            self.result.set_result(self.view.selected_item())
+        else:
+            self.render_schedule()
+
+    async def generate(self):
+        """Generates items in batches, yielding to other tasks in between"""
+        while self.view.item_generator:
+            generated = self.view.items_generate(tuzue.ui.tcurses.GENERATE_TIME)
+            if generated:
+                self.render_schedule()
+                await asyncio.sleep(0)
+            elif self.source is not None:
+                await self.source.ready.wait()
+            else:
+                await asyncio.sleep(tuzue.ui.tcurses.GENERATOR_WAIT_MS / 1000)
+        self.render_schedule()
+
+    async def run(self):
+        tasks = [asyncio.ensure_future(self.generate())]
+        if self.source is not None:
+            tasks.append(asyncio.ensure_future(self.source.run()))
+        for task in tasks:
+            task.add_done_callback(self.task_done)
+        self.loop.add_reader(self.input_fd, self.input_ready)
+        # curses only sees the resize when there's input, handle it here:
+        self.loop.add_signal_handler(signal.SIGWINCH, self.resized)
+        try:
+            self.render()
+            return await self.result
+        finally:
+            self.loop.remove_signal_handler(signal.SIGWINCH)
+            self.loop.remove_reader(self.input_fd)
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def navigate(
+    struct=None,
+    title="",
+    generator=None,
+    source=None,
+    max_items=None,
+    max_bytes=None,
+    preview=None,
+    rank=None,
+):
+    """
+    Shows a menu and returns the selected item, letting other coroutines
+    run in the meantime.
+
+    The items can be provided as a list in struct, by a generator, or by
+    an async iterator in source. preview is an optional callback that
+    returns the text of the preview pane for the selected item, and rank
+    is the number of best matches shown on top; see tuzue.navigate for
+    the arguments that can't be combined.
+    """
+    if rank and (max_items is not None or max_bytes is not None):
+        raise ValueError("rank can't be used with max_items or max_bytes")
+    asource = None
+    if source is not None:
+        asource = AsyncSource(source)
+        generator = asource.generator()
+    view = tuzue.view.View(
+        items=struct,
+        title=title,
+        generator=generator,
+        max_items=max_items,
+        max_bytes=max_bytes,
+        rank=rank,
+    )
+    previewer = None
+    if preview is not None:
+        previewer = tuzue.preview.Previewer(preview)
+    with tuzue.ui.tcurses.context(previewer=previewer) as ui:
+        return await Navigator(ui, view, asource).run()
@@ -11,9 +11,9 @@ class Binput:
         self.string = string
         self.pos = len(string)
 
-    def typed(self, char):
-        self.string = self.string[: self.pos] + char + self.string[self.pos :]
-        self.pos += 1
+    def typed(self, chars):
+        self.string = self.string[: self.pos] + chars + self.string[self.pos :]
+        self.pos += len(chars)
 
     def key_backspace(self):
         if self.string and self.pos > 0:
@@ -0,0 +1,149 @@
+# Copyright (C) 2023 Leandro Lisboa Penz <lpenz@lpenz.org>
+# This file is subject to the terms and conditions defined in
+# file 'LICENSE', which is part of this source code package.
+"""
+Persistent on-disk item cache
+
+Items are stored in a single versioned file that is mmap'ed when
+loaded, so that opening a cached dataset costs O(1) regardless of its
+size. Files are named after a dataset key, which can be provided by
+the caller or derived from a file with file_key.
+
+File layout, all integers in native byte order:
+
+    header:  magic(8) version(u32) flags(u32) count(u64)
+    offsets: (count + 1) * u64, byte offsets into the blob
+    blob:    utf-8 encoded items, each one followed by a newline; bytes
+             that are not utf-8 are kept with surrogateescape, as read
+             by tuzue.reader
+"""
+
+import array
+import collections.abc as abc
+import hashlib
+import itertools
+import mmap
+import os
+import struct
+import sys
+import tempfile
+
+MAGIC = b"TUZUECH\0"
+VERSION = 1
+HEADER = struct.Struct("=8sIIQ")
+
+# No item contains a newline, the blob can be split by lines:
+FLAG_LINES = 1 << 0
+# Byte order of the file, so that we don't load foreign files:
+FLAG_BIGENDIAN = 1 << 1
+
+FLAGS_NATIVE = FLAG_BIGENDIAN if sys.byteorder == "big" else 0
+
+
+def file_key(path):
+    """Returns a dataset key that changes whenever the file changes"""
+    st = os.stat(path)
+    return "%s:%d:%d" % (os.path.realpath(path), st.st_mtime_ns, st.st_size)
+
+
+class ItemStore(abc.Sequence):
+    """Read-only sequence of strings backed by an mmap'ed cache file"""
+
+    def __init__(self, filename):
+        with open(filename, "rb") as fd:
+            self.mm = mmap.mmap(fd.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, flags, count = HEADER.unpack_from(self.mm, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("%s: not a version %d cache" % (filename, VERSION))
+        if flags & FLAG_BIGENDIAN != FLAGS_NATIVE:
+            raise ValueError("%s: cache has a foreign byte order" % filename)
+        self.flags = flags
+        self.count = count
+        offsets_end = HEADER.size + (count + 1) * 8
+        if len(self.mm) < offsets_end:
+            raise ValueError("%s: cache is truncated" % filename)
+        self.offsets = memoryview(self.mm)[HEADER.size : offsets_end].cast("Q")
+        if len(self.mm) < offsets_end + self.offsets[count]:
+            raise ValueError("%s: cache is truncated" % filename)
+        self.blob_start = offsets_end
+        # Decoded items, materialized on the first full scan:
+        self.decoded = None
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(self.count))]
+        if self.decoded is not None:
+            return self.decoded[idx]
+        if idx < 0:
+            idx += self.count
+        if idx < 0 or idx >= self.count:
+            raise IndexError("item index out of range")
+        start = self.blob_start + self.offsets[idx]
+        end = self.blob_start + self.offsets[idx + 1] - 1
+        return self.mm[start:end].decode(errors="surrogateescape")
+
+    def __iter__(self):
+        if self.decoded is None:
+            if self.flags & FLAG_LINES:
+                blob = self.mm[self.blob_start : self.blob_start + self.offsets[-1]]
+                self.decoded = blob.decode(errors="surrogateescape").split("\n")
+                self.decoded.pop()
+            else:
+                self.decoded = [self[i] for i in range(self.count)]
+        return iter(self.decoded)
+
+
+class Cache:
+    """Directory of cached item stores, indexed by dataset key"""
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def filename(self, key):
+        digest = hashlib.sha256(key.encode()).hexdigest()[:32]
+        return os.path.join(self.directory, digest + ".tzc")
+
+    def load(self, key):
+        """Returns the ItemStore for the key, or None if it's not cached"""
+        try:
+            return ItemStore(self.filename(key))
+        except (OSError, ValueError, struct.error):
+            return None
+
+    def store(self, key, items):
+        """Writes the items to the cache and returns the new ItemStore"""
+        os.makedirs(self.directory, exist_ok=True)
+        chunks = [(item + "\n").encode(errors="surrogateescape") for item in items]
+        count = len(chunks)
+        flags = FLAGS_NATIVE
+        if sum(map(bytes.count, chunks, itertools.repeat(b"\n"))) == count:
+            flags |= FLAG_LINES
+        offsets = array.array("Q", [0])
+        offsets.extend(itertools.accumulate(map(len, chunks)))
+        fd, tmpname = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as fp:
+                fp.write(HEADER.pack(MAGIC, VERSION, flags, count))
+                fp.write(offsets.tobytes())
+                fp.writelines(chunks)
+            os.replace(tmpname, self.filename(key))
+        except BaseException:
+            os.unlink(tmpname)
+            raise
+        return ItemStore(self.filename(key))
+
+    def items(self, key, loader):
+        """
+        Returns the cached items for the key; on a miss, stores and returns
+        the items provided by loader, which can be an iterable or a callable
+        that returns one.
+        """
+        store = self.load(key)
+        if store is not None:
+            return store
+        if callable(loader):
+            loader = loader()
+        return self.store(key, loader)
@@ -0,0 +1,170 @@
+# Copyright (C) 2023 Leandro Lisboa Penz <lpenz@lpenz.org>
+# This file is subject to the terms and conditions defined in
+# file 'LICENSE', which is part of this source code package.
+"""
+Command line interface, used by "python -m tuzue" and the tuzue command
+"""
+
+import argparse
+import io
+import os
+import sys
+from contextlib import contextmanager
+
+import tuzue
+import tuzue.query
+import tuzue.reader
+import tuzue.server
+
+
+def text_stream(binary, line_buffering=False):
+    """Wraps a binary stream so that undecodable bytes pass through"""
+    return io.TextIOWrapper(
+        binary,
+        errors="surrogateescape",
+        newline="\n",
+        line_buffering=line_buffering,
+    )
+
+
+def filter_main(query, instream, outstream):
+    query = tuzue.query.Query(query)
+    for lines in tuzue.reader.read_batches(instream):
+        matches = list(tuzue.query.filter_items(lines, query))
+        if matches:
+            outstream.write("\n".join(matches))
+            outstream.write("\n")
+    outstream.flush()
+
+
+@contextmanager
+def tty_stdio():
+    """
+    Points stdin and stdout to the terminal, so that curses works while
+    they are redirected; yields the original (stdin, stdout) as binary
+    streams.
+    """
+    stdin = os.fdopen(os.dup(0), "rb")
+    stdout = os.fdopen(os.dup(1), "wb")
+    tty = os.open("/dev/tty", os.O_RDWR)
+    try:
+        os.dup2(tty, 0)
+        os.dup2(tty, 1)
+        yield stdin, stdout
+    finally:
+        sys.stdout.flush()
+        os.dup2(stdout.fileno(), 1)
+        os.dup2(stdin.fileno(), 0)
+        os.close(tty)
+
+
+def picker_main(title, max_items=None, max_bytes=None, rank=None):
+    with tty_stdio() as (stdin, stdout):
+        reader = tuzue.reader.Reader(stdin)
+        reader.start()
+        selected = tuzue.navigate(
+            title=title,
+            generator=reader.generator(),
+            max_items=max_items,
+            max_bytes=max_bytes,
+            rank=rank,
+        )
+    if selected is None:
+        return 1
+    outstream = text_stream(stdout)
+    outstream.write(selected + "\n")
+    outstream.flush()
+    return 0
+
+
+def serve_main(path, instream, mode=None, group=None):
+    items = []
+    for lines in tuzue.reader.read_batches(instream):
+        items.extend(lines)
+    with tuzue.server.Server(path, items, mode=mode, group=group) as server:
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            os.unlink(path)
+    return 0
+
+
+def connect_main(path, title):
+    with tty_stdio() as (_, stdout):
+        selected = tuzue.server.navigate(path, title=title)
+    if selected is None:
+        return 1
+    outstream = text_stream(stdout)
+    outstream.write(selected + "\n")
+    outstream.flush()
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="tuzue", description="Fuzzy-filtering menu for the lines of stdin"
+    )
+    parser.add_argument("--title", default="", help="title shown above the menu")
+    parser.add_argument(
+        "--filter",
+        metavar="QUERY",
+        help="don't show the menu, just print the lines that match QUERY",
+    )
+    parser.add_argument(
+        "--max-items",
+        metavar="N",
+        type=int,
+        help="keep only the last N lines read, for endless inputs like tail -f",
+    )
+    parser.add_argument(
+        "--max-bytes",
+        metavar="N",
+        type=int,
+        help="keep only the last lines read that fit in N bytes of memory",
+    )
+    parser.add_argument(
+        "--rank",
+        metavar="K",
+        type=int,
+        help="show the best K matches on top, as lines are still being read",
+    )
+    parser.add_argument(
+        "--serve",
+        metavar="SOCKET",
+        help="don't show the menu, serve the lines to --connect pickers",
+    )
+    parser.add_argument(
+        "--mode",
+        type=lambda mode: int(mode, 8),
+        help="octal permissions of the --serve socket, e.g. 660",
+    )
+    parser.add_argument(
+        "--group",
+        help="group of the --serve socket, to share it with its members",
+    )
+    parser.add_argument(
+        "--connect",
+        metavar="SOCKET",
+        help="show the menu with the lines of a --serve server",
+    )
+    args = parser.parse_args(argv)
+    if args.connect is not None:
+        return connect_main(args.connect, args.title)
+    if args.serve is not None:
+        return serve_main(args.serve, sys.stdin.buffer, args.mode, args.group)
+    if args.filter is None:
+        if sys.stdin.isatty():
+            parser.error("the menu items must be piped into stdin")
+        if args.rank and (args.max_items or args.max_bytes):
+            parser.error("--rank can't be used with --max-items or --max-bytes")
+        return picker_main(args.title, args.max_items, args.max_bytes, args.rank)
+    outstream = text_stream(sys.stdout.buffer)
+    try:
+        filter_main(args.filter, sys.stdin.buffer, outstream)
+    except BrokenPipeError:
+        # Downstream is gone, e.g. "| head"; don't complain at exit:
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+    return 0
@@ -5,9 +5,27 @@
 "inspect" function that is specially useful in PDB
 """
 
+import collections
 import collections.abc as abc
+import inspect as pyinspect
+import numbers
+import reprlib
+import time
 
-import tuzue
+import tuzue.ui.tcurses
+import tuzue.view
+
+# Item that starts a deep search from the current object:
+DEEP_SEARCH = "**"
+
+# Limits of the deep search:
+DEEP_MAX_DEPTH = 8
+DEEP_MAX_NODES = 200000
+DEEP_TIME_LIMIT = 30.0
+
+deep_repr = reprlib.Repr()
+deep_repr.maxstring = 60
+deep_repr.maxother = 60
 
 
 def process(objdict, key, value, f=repr, pre="[", pos="]"):
@@ -24,6 +42,7 @@ def identity(x):
 def generator(obj, objdict):
     yield "."
     yield ".."
+    yield DEEP_SEARCH
     if isinstance(obj, abc.Mapping):
         for key, value in obj.items():
             yield process(objdict, key, value)
@@ -46,6 +65,78 @@ def generator(obj, objdict):
             yield process(objdict, key, value, identity, ".", "")
 
 
+def children(obj):
+    """Yields the (path, value) of the public data children of obj"""
+    if isinstance(obj, abc.Mapping):
+        for key, value in obj.items():
+            yield "[%r]" % (key,), value
+    elif isinstance(obj, abc.Sequence) and not isinstance(obj, (str, bytes)):
+        for key, value in enumerate(obj):
+            yield "[%r]" % key, value
+    for key in dir(obj):
+        if not key.startswith("_"):
+            try:
+                value = getattr(obj, key)
+            except Exception as e:
+                value = e
+            # Methods are not where data lives, and there are lots of them:
+            if not pyinspect.isroutine(value):
+                yield "." + key, value
+
+
+def descend(value):
+    """Returns True if deep search should look inside the value"""
+    if isinstance(value, (str, bytes, numbers.Number, type(None), BaseException)):
+        return False
+    return not (
+        pyinspect.isroutine(value)
+        or pyinspect.ismodule(value)
+        or pyinspect.isclass(value)
+    )
+
+
+def safe_repr(value):
+    try:
+        return deep_repr.repr(value)
+    except Exception as e:
+        return "<repr failed: %r>" % e
+
+
+def deep_generator(
+    obj,
+    objdict,
+    max_depth=DEEP_MAX_DEPTH,
+    max_nodes=DEEP_MAX_NODES,
+    time_limit=DEEP_TIME_LIMIT,
+):
+    """
+    Walks the object graph breadth-first from obj and yields the full path
+    and a short repr of each object found, to be matched by the view.
+
+    Objects are visited once, and the walk stops at max_depth, after
+    max_nodes items or after time_limit seconds, which also bounds the
+    memory used.
+    """
+    yield ".."
+    deadline = time.monotonic() + time_limit
+    seen = {id(obj)}
+    queue = collections.deque([([], obj, 0)])
+    nodes = 0
+    while queue:
+        path, node, depth = queue.popleft()
+        for part, value in children(node):
+            if nodes >= max_nodes or time.monotonic() > deadline:
+                return
+            nodes += 1
+            childpath = path + [part]
+            item = "%s = %s" % ("".join(childpath), safe_repr(value))
+            objdict[item] = (childpath, value)
+            yield item
+            if depth + 1 < max_depth and id(value) not in seen and descend(value):
+                seen.add(id(value))
+                queue.append((childpath, value, depth + 1))
+
+
 class Inspector:
     def __init__(self, ui):
         self.ui = ui
@@ -60,20 +151,48 @@ class Inspector:
             while not done:
                 self.ui.show(view)
                 done = self.ui.interact(view)
-            obj = view.selected_item()
-            if obj == ".":
+            item = view.selected_item()
+            if item == ".":
                 self.done = True
                 return
-            if obj == "..":
+            if item == "..":
                 if lvl == 0:
                     self.done = True
                 return
-            objdata = objdict[obj]
+            if item == DEEP_SEARCH:
+                found = self.deep_search(path0, obj)
+                if found is None:
+                    continue
+                path = list(path0) + found[0]
+                self.result = (path, found[1])
+                self.inspect(path, found[1], lvl + 1)
+                continue
+            objdata = objdict[item]
             path = list(path0)
             path.append(objdata[0])
             self.result = (path, objdata[1])
             self.inspect(path, objdata[1], lvl + 1)
 
+    def deep_search(self, path0, obj):
+        """
+        Shows the objects reachable from obj, found in the background while
+        the user types the query; returns the (path, value) of the selected
+        one, or None.
+        """
+        objdict = {}
+        view = tuzue.view.View(
+            title="".join(path0) + " " + DEEP_SEARCH,
+            generator=deep_generator(obj, objdict),
+        )
+        done = False
+        while not done:
+            self.ui.show(view)
+            done = self.ui.interact(view)
+        item = view.selected_item()
+        if item is None or item == "..":
+            return None
+        return objdict[item]
+
 
 def inspect(obj=None, name=None):
     if obj is None:
@@ -0,0 +1,66 @@
+# Copyright (C) 2023 Leandro Lisboa Penz <lpenz@lpenz.org>
+# This file is subject to the terms and conditions defined in
+# file 'LICENSE', which is part of this source code package.
+"""
+Previewer that generates the preview of items in a thread pool, so that
+slow previews never block the UI, and keeps the results in a LRU cache.
+"""
+
+import collections
+import concurrent.futures
+import threading
+
+
+class Previewer:
+    def __init__(self, callback, cache_size=128, max_workers=1):
+        # User callback that returns the preview of an item:
+        self.callback = callback
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers)
+        # LRU cache of previews by item, shared with the workers:
+        self.cache = collections.OrderedDict()
+        self.cache_size = cache_size
+        self.lock = threading.Lock()
+        # Item whose preview is being generated, and its future:
+        self.pending_item = None
+        self.pending = None
+        # Called from the worker thread when a preview is ready:
+        self.on_ready = None
+
+    def get(self, item):
+        """
+        Returns the preview of the item if it's cached; otherwise schedules
+        its generation, cancelling the previous one if it hasn't started,
+        and returns None.
+        """
+        with self.lock:
+            if item in self.cache:
+                self.cache.move_to_end(item)
+                return self.cache[item]
+        if self.pending is not None and not self.pending.done():
+            if self.pending_item == item:
+                return None
+            self.pending.cancel()
+        self.pending_item = item
+        self.pending = self.executor.submit(self.generate, item)
+        return None
+
+    def busy(self):
+        """Returns True if we have a preview being generated"""
+        return self.pending is not None and not self.pending.done()
+
+    def generate(self, item):
+        try:
+            preview = str(self.callback(item))
+        except Exception as e:
+            preview = repr(e)
+        with self.lock:
+            self.cache[item] = preview
+            while len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+        if self.on_ready:
+            self.on_ready()
+
+    def shutdown(self):
+        if self.pending is not None:
+            self.pending.cancel()
+        self.executor.shutdown(wait=False)
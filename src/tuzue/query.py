@@ -0,0 +1,266 @@
+# Copyright (C) 2023 Leandro Lisboa Penz <lpenz@lpenz.org>
+# This file is subject to the terms and conditions defined in
+# file 'LICENSE', which is part of this source code package.
+"""
+Query language used to filter items, compiled into a predicate
+
+Space-separated terms must all match; each term can be:
+
+    foo     items that contain foo
+    ^foo    items that start with foo
+    foo$    items that end with foo
+    ^foo$   items that are exactly foo
+    'foo    items that contain foo, with no special characters in foo
+    !foo    items that don't match foo, combinable with the above
+
+Terms separated by a "|" term form a group that matches if any of them
+does, as in "^core | ^lib".
+"""
+
+import collections.abc as abc
+
+SUBSTRING = "substring"
+PREFIX = "prefix"
+SUFFIX = "suffix"
+EXACT = "exact"
+
+
+class Term:
+    """A single term of the query"""
+
+    def __init__(self, kind, text, negate=False):
+        self.kind = kind
+        self.text = text
+        self.negate = negate
+
+    @classmethod
+    def parse(cls, token):
+        """Returns the Term for the token, or None if it has no text"""
+        negate = token.startswith("!")
+        if negate:
+            token = token[1:]
+        kind = SUBSTRING
+        if token.startswith("'"):
+            token = token[1:]
+        else:
+            prefix = token.startswith("^")
+            if prefix:
+                token = token[1:]
+            suffix = token.endswith("$")
+            if suffix:
+                token = token[:-1]
+            if prefix and suffix:
+                kind = EXACT
+            elif prefix:
+                kind = PREFIX
+            elif suffix:
+                kind = SUFFIX
+        if not token:
+            return None
+        return cls(kind, token, negate)
+
+    def __eq__(self, other):
+        return (self.kind, self.text, self.negate) == (
+            other.kind,
+            other.text,
+            other.negate,
+        )
+
+    def __repr__(self):
+        return "Term(%r, %r, %r)" % (self.kind, self.text, self.negate)
+
+    def predicate(self):
+        text = self.text
+        if self.kind == EXACT:
+            return text.__ne__ if self.negate else text.__eq__
+        if self.kind == PREFIX:
+            if self.negate:
+                return lambda item: not item.startswith(text)
+            return lambda item: item.startswith(text)
+        if self.kind == SUFFIX:
+            if self.negate:
+                return lambda item: not item.endswith(text)
+            return lambda item: item.endswith(text)
+        if self.negate:
+            return lambda item: text not in item
+        return lambda item: text in item
+
+    def position(self, item):
+        """
+        Returns where the term matches the item, or -1 if it doesn't; anchored
+        terms match at 0.
+        """
+        if self.kind == SUBSTRING:
+            return item.find(self.text)
+        return 0 if self.predicate()(item) else -1
+
+    def span(self, item):
+        """Returns the range of positions of item matched by the term"""
+        if self.kind == SUFFIX:
+            if not item.endswith(self.text):
+                return range(0)
+            return range(len(item) - len(self.text), len(item))
+        start = self.position(item)
+        if start < 0:
+            return range(0)
+        return range(start, start + len(self.text))
+
+    def selectivity(self):
+        """
+        Rough estimate of the fraction of items that match the term: longer
+        texts match less, anchored terms less than substrings.
+        """
+        if self.kind == EXACT:
+            estimate = 0.0
+        elif self.kind == SUBSTRING:
+            estimate = 0.5 ** len(self.text)
+        else:
+            estimate = 0.3 ** len(self.text)
+        return 1.0 - estimate if self.negate else estimate
+
+    def implies(self, other):
+        """Returns True if every item matched by self is matched by other"""
+        if self.negate != other.negate:
+            return False
+        if self.negate:
+            # not A => not B is the same as B => A
+            return Term(other.kind, other.text).implies(Term(self.kind, self.text))
+        if other.kind == SUBSTRING:
+            return other.text in self.text
+        if other.kind == PREFIX:
+            return self.kind in {PREFIX, EXACT} and self.text.startswith(other.text)
+        if other.kind == SUFFIX:
+            return self.kind in {SUFFIX, EXACT} and self.text.endswith(other.text)
+        return self.kind == EXACT and self.text == other.text
+
+
+def group_predicate(group):
+    if len(group) == 1:
+        return group[0].predicate()
+    predicates = [term.predicate() for term in group]
+    return lambda item: any(p(item) for p in predicates)
+
+
+def group_selectivity(group):
+    return min(1.0, sum(term.selectivity() for term in group))
+
+
+def group_implies(group, other):
+    """Returns True if the group of alternatives implies the other group"""
+    return all(any(t.implies(o) for o in other) for t in group)
+
+
+class Query:
+    """
+    Parsed and compiled query
+
+    The match attribute is the compiled predicate, with the groups of terms
+    ordered by selectivity so that most items are rejected by the first
+    check.
+    """
+
+    def __init__(self, string=""):
+        self.string = string
+        self.groups = []
+        group = []
+        alternative = False
+        for token in string.split():
+            if token == "|":
+                alternative = bool(group)
+                continue
+            term = Term.parse(token)
+            if term is None:
+                continue
+            if alternative:
+                group.append(term)
+                alternative = False
+            else:
+                if group:
+                    self.groups.append(tuple(group))
+                group = [term]
+        if group:
+            self.groups.append(tuple(group))
+        self.groups.sort(key=group_selectivity)
+        self.match = self.compile()
+
+    def empty(self):
+        return not self.groups
+
+    def compile(self):
+        predicates = [group_predicate(group) for group in self.groups]
+        if not predicates:
+            return lambda item: True
+        if len(predicates) == 1:
+            return predicates[0]
+        if len(predicates) == 2:
+            p0, p1 = predicates
+            return lambda item: p0(item) and p1(item)
+        return lambda item: all(p(item) for p in predicates)
+
+    def score(self, item):
+        """
+        Returns the rank score of a matching item, lower being better: the
+        earlier the terms match the better, and then the shorter the better.
+        """
+        total = 0
+        for group in self.groups:
+            positions = [t.position(item) for t in group if not t.negate]
+            positions = [p for p in positions if p >= 0]
+            if positions:
+                total += min(positions)
+        return total * 1024 + min(len(item), 1023)
+
+    def positions(self, item):
+        """Returns the sorted positions of item matched by the query"""
+        positions = set()
+        for group in self.groups:
+            for term in group:
+                if not term.negate:
+                    positions.update(term.span(item))
+        return sorted(positions)
+
+    def narrows(self, other):
+        """
+        Returns True if every item matched by self is also matched by other,
+        which allows us to filter other's results instead of all items.
+        """
+        return all(
+            any(group_implies(group, ogroup) for group in self.groups)
+            for ogroup in other.groups
+        )
+
+
+def filter_items(items, query):
+    """
+    Returns an iterator over the items that match the query, which can be
+    a string or a Query; items are consumed lazily, so this can be used
+    on streams.
+    """
+    if not isinstance(query, Query):
+        query = Query(query)
+    if query.empty():
+        return iter(items)
+    return filter(query.match, items)
+
+
+def filter_batch(items, queries):
+    """
+    Returns a list with the items that match each one of the queries.
+
+    Queries that narrow a query evaluated before filter its results
+    instead of all items.
+    """
+    if not isinstance(items, abc.Sequence):
+        items = list(items)
+    compiled = []
+    results = []
+    for query in queries:
+        if not isinstance(query, Query):
+            query = Query(query)
+        source = items
+        for previous, result in zip(compiled, results):
+            if len(result) < len(source) and query.narrows(previous):
+                source = result
+        compiled.append(query)
+        results.append(list(filter_items(source, query)))
+    return results
@@ -0,0 +1,87 @@
+# Copyright (C) 2023 Leandro Lisboa Penz <lpenz@lpenz.org>
+# This file is subject to the terms and conditions defined in
+# file 'LICENSE', which is part of this source code package.
+"""
+Container of items that keeps the best k of them on top, used by View
+when ranking is enabled.
+"""
+
+import bisect
+
+
+class RankedItems:
+    """
+    Sequence of items where the best k items by score (lower is better)
+    come first, in order, followed by the unranked tail in arrival order.
+
+    The top is kept sorted, and items are inserted in it by bisection, so
+    appending an item takes O(log k) comparisons; the list insertion only
+    moves k references in memory.
+    """
+
+    def __init__(self, k, score, items=()):
+        self.k = k
+        self.score = score
+        # Sorted top k, as (score, seq, item) so that the best item comes
+        # first; seq makes items that arrived first win ties:
+        self.top = []
+        self.seq = 0
+        # Items that are not in the top:
+        self.tail = []
+        for item in items:
+            self.append(item)
+
+    def append(self, item):
+        """
+        Appends the item; returns its index if it went into the top, where
+        it pushes down the items after it, or None if it went to the tail.
+        """
+        entry = (self.score(item), self.seq, item)
+        self.seq += 1
+        if len(self.top) == self.k:
+            if entry >= self.top[-1]:
+                self.tail.append(item)
+                return None
+            self.tail.append(self.top.pop()[2])
+        pos = bisect.bisect(self.top, entry)
+        self.top.insert(pos, entry)
+        return pos
+
+    def shifted(self, idx, pos):
+        """
+        Returns the index of the item that was at idx before the append
+        that ranked an item at pos.
+        """
+        if idx < pos:
+            return idx
+        if not self.tail or idx < self.k - 1:
+            return idx + 1
+        if idx == self.k - 1:
+            # It was the worst of a full top, and went to the end of the tail:
+            return len(self) - 1
+        return idx
+
+    def unranked(self):
+        """Returns the number of items in the unranked tail"""
+        return len(self.tail)
+
+    def __len__(self):
+        return len(self.top) + len(self.tail)
+
+    def __getitem__(self, idx):
+        if idx < 0:
+            idx += len(self)
+        if idx < len(self.top):
+            return self.top[idx][2]
+        return self.tail[idx - len(self.top)]
+
+    def __iter__(self):
+        for entry in self.top:
+            yield entry[2]
+        yield from self.tail
+
+    def index(self, item):
+        for idx, entry in enumerate(self.top):
+            if entry[2] == item:
+                return idx
+        return len(self.top) + self.tail.index(item)
@@ -0,0 +1,70 @@
+# Copyright (C) 2023 Leandro Lisboa Penz <lpenz@lpenz.org>
+# This file is subject to the terms and conditions defined in
+# file 'LICENSE', which is part of this source code package.
+"""
+Reader that ingests lines from a stream in a background thread and
+provides them to a View as an item generator.
+"""
+
+import codecs
+import collections
+import threading
+
+BATCH_SIZE = 1 << 20
+
+
+def read_batches(stream, size=BATCH_SIZE):
+    """
+    Yields lists of lines read from the binary stream.
+
+    Lines are yielded as soon as they are available, so that the
+    stream can be a pipe with a slow producer. Undecodable bytes
+    are passed through with surrogateescape.
+    """
+    read = getattr(stream, "read1", stream.read)
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="surrogateescape")
+    partial = ""
+    while True:
+        chunk = read(size)
+        if not chunk:
+            break
+        lines = (partial + decoder.decode(chunk)).split("\n")
+        partial = lines.pop()
+        if lines:
+            yield lines
+    partial += decoder.decode(b"", final=True)
+    if partial:
+        yield [partial]
+
+
+class Reader(threading.Thread):
+    """Thread that reads batches of lines from a binary stream"""
+
+    def __init__(self, stream):
+        super().__init__(daemon=True)
+        self.stream = stream
+        # deque append and popleft are thread-safe:
+        self.batches = collections.deque()
+        self.done = False
+
+    def run(self):
+        try:
+            for batch in read_batches(self.stream):
+                self.batches.append(batch)
+        finally:
+            self.done = True
+
+    def generator(self):
+        """
+        Item generator for View: yields the lines read so far, and None
+        when we have to wait for more.
+        """
+        while True:
+            if self.batches:
+                yield from self.batches.popleft()
+            elif self.done:
+                # All batches were appended before done was set:
+                if not self.batches:
+                    return
+            else:
+                yield None
@@ -0,0 +1,242 @@
+# Copyright (C) 2023 Leandro Lisboa Penz <lpenz@lpenz.org>
+# This file is subject to the terms and conditions defined in
+# file 'LICENSE', which is part of this source code package.
+"""
+Index server that holds the items once and answers filter queries from
+many pickers over a unix socket, with paged results.
+
+The protocol is line-based JSON: each request is an object with query,
+offset and limit, and each response has the total number of matches and
+the requested page of items. A request can also have an item to find,
+and then the response has its index in the matches, or null.
+"""
+
+import collections
+import collections.abc as abc
+import json
+import os
+import shutil
+import socket
+import socketserver
+import stat
+import threading
+
+import tuzue.query
+import tuzue.view
+
+PAGE_SIZE = 256
+
+# Limit of item references held by the cached results of an Index, about
+# 8 bytes each:
+CACHE_ITEMS = 1 << 22
+
+
+class Index:
+    """
+    Items and a LRU cache of query results, shared by all clients. The
+    cache holds at most cache_size results, with at most cache_items items
+    in total; larger results are not cached.
+    """
+
+    def __init__(self, items, cache_size=64, cache_items=CACHE_ITEMS):
+        self.items = items
+        self.cache_size = cache_size
+        self.cache_items = cache_items
+        # Query string -> (Query, matching items):
+        self.results = collections.OrderedDict()
+        # Total number of items in results:
+        self.results_items = 0
+        self.lock = threading.Lock()
+
+    def matches(self, string):
+        query = tuzue.query.Query(string)
+        if query.empty():
+            return self.items
+        with self.lock:
+            cached = self.results.get(string)
+            if cached is not None:
+                self.results.move_to_end(string)
+                return cached[1]
+            # Filter the smallest cached result that contains ours:
+            source = self.items
+            for cquery, cresult in self.results.values():
+                if len(cresult) < len(source) and query.narrows(cquery):
+                    source = cresult
+        result = list(filter(query.match, source))
+        if len(result) > self.cache_items:
+            return result
+        with self.lock:
+            if string not in self.results:
+                self.results[string] = (query, result)
+                self.results_items += len(result)
+            while (
+                len(self.results) > self.cache_size
+                or self.results_items > self.cache_items
+            ):
+                _, (_, evicted) = self.results.popitem(last=False)
+                self.results_items -= len(evicted)
+        return result
+
+    def request(self, request):
+        result = self.matches(request.get("query", ""))
+        offset = request.get("offset", 0)
+        limit = request.get("limit", PAGE_SIZE)
+        response = {
+            "total": len(result),
+            "items": list(result[offset : offset + limit]),
+        }
+        find = request.get("find")
+        if find is not None:
+            try:
+                response["index"] = result.index(find)
+            except ValueError:
+                response["index"] = None
+        return response
+
+
+class Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            try:
+                response = self.server.index.request(json.loads(line))
+            except (ValueError, TypeError, AttributeError) as e:
+                response = {"error": str(e)}
+            self.wfile.write(json.dumps(response).encode() + b"\n")
+
+
+def unlink_stale(path):
+    """Removes the socket at path if nothing is listening on it"""
+    try:
+        if not stat.S_ISSOCK(os.stat(path).st_mode):
+            return
+    except FileNotFoundError:
+        return
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+    except ConnectionRefusedError:
+        os.unlink(path)
+    finally:
+        sock.close()
+
+
+class Server(socketserver.ThreadingUnixStreamServer):
+    """
+    Server of the items at the socket path. mode and group, if given, are
+    applied to the socket so that other users can connect to it.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, path, items, mode=None, group=None):
+        self.index = Index(items)
+        self.mode = mode
+        self.group = group
+        super().__init__(path, Handler)
+
+    def server_bind(self):
+        # A server that crashed leaves its socket behind:
+        unlink_stale(self.server_address)
+        super().server_bind()
+        if self.group is not None:
+            shutil.chown(self.server_address, group=self.group)
+        if self.mode is not None:
+            os.chmod(self.server_address, self.mode)
+
+
+class Client:
+    """Connection to a Server; not thread-safe, use one per thread"""
+
+    def __init__(self, path):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(path)
+        self.rfile = self.sock.makefile("rb")
+
+    def request(self, **request):
+        """Sends the request and returns the response, as dicts"""
+        self.sock.sendall(json.dumps(request).encode() + b"\n")
+        response = json.loads(self.rfile.readline())
+        if "error" in response:
+            raise ValueError(response["error"])
+        return response
+
+    def filter(self, query, offset=0, limit=PAGE_SIZE):
+        """Returns the total number of matches and the requested page"""
+        response = self.request(query=query, offset=offset, limit=limit)
+        return response["total"], response["items"]
+
+    def close(self):
+        self.rfile.close()
+        self.sock.close()
+
+
+class RemoteItems(abc.Sequence):
+    """
+    Sequence of the items that match a query, fetched by page on access.
+    If find is given, found is its index in the matches, or None.
+    """
+
+    def __init__(self, client, query, max_pages=64, find=None):
+        self.client = client
+        self.query = query
+        self.max_pages = max_pages
+        response = client.request(query=query, find=find)
+        self.total = response["total"]
+        self.found = response.get("index")
+        self.pages = collections.OrderedDict([(0, response["items"])])
+
+    def __len__(self):
+        return self.total
+
+    def __getitem__(self, idx):
+        if idx < 0:
+            idx += self.total
+        if idx < 0 or idx >= self.total:
+            raise IndexError("item index out of range")
+        pagenum = idx // PAGE_SIZE
+        page = self.pages.get(pagenum)
+        if page is None:
+            _, page = self.client.filter(self.query, pagenum * PAGE_SIZE)
+            self.pages[pagenum] = page
+            while len(self.pages) > self.max_pages:
+                self.pages.popitem(last=False)
+        else:
+            self.pages.move_to_end(pagenum)
+        return page[idx - pagenum * PAGE_SIZE]
+
+
+class RemoteView(tuzue.view.View):
+    """View whose items are filtered by a Server"""
+
+    def __init__(self, client, title=""):
+        self.client = client
+        super().__init__(title=title, items=RemoteItems(client, ""))
+
+    def items_update(self):
+        """Gets the items of the current input from the server, which also
+        finds the selected item in them"""
+        selected_item = self.selected_item()
+        self.query = tuzue.query.Query(self.binput.string)
+        self.items = RemoteItems(self.client, self.binput.string, find=selected_item)
+        self.selected_idx = self.items.found
+        if self.selected_idx is None and self.items:
+            self.selected_idx = 0
+        if not self.selected_in_screen():
+            self.screen_center()
+
+
+def navigate(path, title=""):
+    """Shows a menu with the items of the Server at path"""
+    import tuzue.ui.tcurses
+
+    client = Client(path)
+    try:
+        view = RemoteView(client, title=title)
+        done = None
+        with tuzue.ui.tcurses.context() as ui:
+            while not done:
+                ui.show(view)
+                done = ui.interact(view)
+        return view.selected_item()
+    finally:
+        client.close()
@@ -0,0 +1,143 @@
+# Copyright (C) 2023 Leandro Lisboa Penz <lpenz@lpenz.org>
+# This file is subject to the terms and conditions defined in
+# file 'LICENSE', which is part of this source code package.
+"""
+Navigation of nested structures of mappings and sequences
+
+Levels are expanded on demand, like the inspector does with objects, or
+walked lazily by a generator that feeds a single flat view.
+"""
+
+import collections.abc as abc
+
+import tuzue.view
+
+
+def is_container(value):
+    if isinstance(value, abc.Mapping):
+        return True
+    return isinstance(value, abc.Sequence) and not isinstance(value, (str, bytes))
+
+
+def is_nested(struct):
+    """
+    Returns True if the struct should be navigated as a tree: mappings are
+    if any of their values is a container, and sequences are if their
+    first element is a container. Other structs are shown as a plain menu
+    of their items, or keys for mappings.
+    """
+    if isinstance(struct, abc.Mapping):
+        return any(map(is_container, struct.values()))
+    return is_container(struct) and len(struct) > 0 and is_container(struct[0])
+
+
+def children(node):
+    """Returns an iterator over the (key, value) pairs of the container"""
+    if isinstance(node, abc.Mapping):
+        return iter(node.items())
+    return enumerate(node)
+
+
+def path_str(keys):
+    return "".join("[%r]" % key for key in keys)
+
+
+def summary(value):
+    """Short representation of the value, that doesn't expand containers"""
+    if isinstance(value, abc.Mapping):
+        return "{...} (%d)" % len(value)
+    if is_container(value):
+        return "[...] (%d)" % len(value)
+    return repr(value)
+
+
+def entries(node, entrydict):
+    """Generator of the items of a level; fills entrydict with their data"""
+    yield ".."
+    for key, value in children(node):
+        item = "[%r] = %s" % (key, summary(value))
+        entrydict[item] = (key, value)
+        yield item
+
+
+def flatten(root, entrydict):
+    """
+    Generator that walks the tree depth-first and yields the path of each
+    leaf; fills entrydict with their (keys, value).
+    """
+    stack = [((), children(root))]
+    while stack:
+        keys, iterator = stack[-1]
+        try:
+            key, value = next(iterator)
+        except StopIteration:
+            stack.pop()
+            continue
+        leafkeys = keys + (key,)
+        if is_container(value) and len(value) > 0:
+            stack.append((leafkeys, children(value)))
+            continue
+        item = "%s = %s" % (path_str(leafkeys), repr(value))
+        entrydict[item] = (leafkeys, value)
+        yield item
+
+
+class Tree:
+    def __init__(self, ui):
+        self.ui = ui
+
+    def select(self, view):
+        done = False
+        while not done:
+            self.ui.show(view)
+            done = self.ui.interact(view)
+        return view.selected_item()
+
+    def navigate(self, root, title=""):
+        """
+        Lets the user drill down the tree level by level; returns the
+        (keys, value) of the selected leaf, or None if the user leaves the
+        root with "..".
+        """
+        keys = ()
+        node = root
+        # Parent levels, with their views, so that we can resume them:
+        stack = []
+        entrydict = {}
+        view = tuzue.view.View(title=title, generator=entries(node, entrydict))
+        while True:
+            item = self.select(view)
+            if item is None:
+                continue
+            if item == "..":
+                if not stack:
+                    return None
+                keys, node, view, entrydict = stack.pop()
+                continue
+            key, value = entrydict[item]
+            if not is_container(value):
+                return keys + (key,), value
+            stack.append((keys, node, view, entrydict))
+            keys = keys + (key,)
+            node = value
+            entrydict = {}
+            view = tuzue.view.View(
+                title=title + path_str(keys), generator=entries(node, entrydict)
+            )
+
+    def search(self, root, title="", rank=None, entrydict=None):
+        """
+        Shows all the leaves in a single view, fed lazily as the tree is
+        walked, with the best rank matches on top if given; returns the
+        (keys, value) of the selected one. entrydict, if given, is filled
+        with the (keys, value) of the leaves by item.
+        """
+        if entrydict is None:
+            entrydict = {}
+        view = tuzue.view.View(
+            title=title, generator=flatten(root, entrydict), rank=rank
+        )
+        item = self.select(view)
+        if item is None:
+            return None
+        return entrydict[item]
@@ -13,14 +13,67 @@ efficiently. It serves as a bridge between the View class and the
 downstream ui implementation - but for now only curses is available.
 """
 
-
 import curses
+import os
 from contextlib import contextmanager
 from typing import Dict
 
 from tuzue.logger import logger
 from tuzue.view import View
 
+# Time spent generating items between screen updates, in seconds:
+GENERATE_TIME = 0.05
+
+# Time waiting for keys when the item generator is not ready, in ms:
+GENERATOR_WAIT_MS = 50
+
+
+# Bracketed paste: the terminal surrounds pasted text with these:
+PASTE_START = [27] + [ord(c) for c in "[200~"]
+PASTE_END = [27] + [ord(c) for c in "[201~"]
+PASTE_ENABLE = b"\x1b[?2004h"
+PASTE_DISABLE = b"\x1b[?2004l"
+
+
+def find(keys, sequence, start):
+    """Returns the position of sequence in keys, or len(keys)"""
+    for i in range(start, len(keys) - len(sequence) + 1):
+        if keys[i : i + len(sequence)] == sequence:
+            return i
+    return len(keys)
+
+
+def find_partial(keys, sequence, start):
+    """
+    Returns the length of the longest end of keys[start:] that is the
+    beginning of sequence, which may be completed by the next keys.
+    """
+    for length in range(min(len(sequence) - 1, len(keys) - start), 0, -1):
+        if keys[len(keys) - length :] == sequence[:length]:
+            return length
+    return 0
+
+
+def text_printable(text):
+    """Decodes the utf-8 text, keeping only the printable characters"""
+    return "".join(c for c in text.decode(errors="replace") if c.isprintable())
+
+
+def runs(positions):
+    """Yields the (start, length) of the runs of consecutive positions"""
+    start = None
+    length = 0
+    for pos in positions:
+        if start is not None and pos == start + length:
+            length += 1
+            continue
+        if start is not None:
+            yield start, length
+        start = pos
+        length = 1
+    if start is not None:
+        yield start, length
+
 
 class CursesError(Exception):
     pass
@@ -52,6 +105,22 @@ class CursesWin:
         except curses.error:
             raise CursesError("win {} could not addstr {}\n".format(self.label, string))
 
+    def highlight(self, line, col, string, positions, attr):
+        """Sets attr on the positions of string, that was written by addstr"""
+        visible = len(string)
+        if visible > self.width - col:
+            visible = self.width - col - 4
+        for start, length in runs(positions):
+            if start >= visible:
+                break
+            length = min(length, visible - start)
+            try:
+                self.win.chgat(line, col + start, length, attr)
+            except curses.error:
+                raise CursesError(
+                    "win {} could not chgat {}\n".format(self.label, line)
+                )
+
     def set_cursor(self, line, col):
         curses.setsyx(self.line + line, self.col + col)
 
@@ -74,6 +143,7 @@ class Windows:
         self.prompt = None
         self.binput = None
         self.menu = None
+        self.preview = None
 
 
 class UiCursesBase:
@@ -85,6 +155,7 @@ class UiCursesBase:
     """
 
     prompt = "> "
+    highlight_attr = curses.A_BOLD | curses.A_UNDERLINE
     edit_actions: Dict[bytes, object] = {}
     edit_actions_default = {
         b"KEY_ENTER": View.key_enter,
@@ -105,9 +176,18 @@ class UiCursesBase:
         b"^[KEY_BACKSPACE": View.key_killwordleft,
     }
 
-    def __init__(self):
+    def __init__(self, previewer=None):
         self.stdscr = None
         self.win = Windows()
+        # Optional tuzue.preview.Previewer for the selected item:
+        self.previewer = previewer
+        # Current getch timeout of the input window:
+        self.timeout = None
+        # True while we are in a bracketed paste that spans several reads,
+        # and the keys of a possibly partial PASTE_END held back from the
+        # last one:
+        self.pasting = False
+        self.keys_pending = []
 
     def start(self):
         """
@@ -134,15 +214,21 @@ class UiCursesBase:
             curses.use_default_colors()
         except curses.error:
             pass
+        # Ask the terminal to mark pastes, so that we get them in one go;
+        # curses writes to fd 1 as well:
+        os.write(1, PASTE_ENABLE)
         self.layout()
 
     def end(self):
+        if self.previewer:
+            self.previewer.shutdown()
         if not self.stdscr:
             return
         # Set everything back to normal
         if curses.has_colors():
             curses.use_default_colors()
         self.stdscr.keypad(0)
+        os.write(1, PASTE_DISABLE)
         curses.echo()
         curses.nocbreak()
         curses.endwin()
@@ -158,15 +244,14 @@ class UiCursesBase:
         with winfocus(self.win.menu) as win:
             win.erase()
             view.screen_height_set(self.max_items())
-            for i, item in enumerate(view.screen_items()):
-                win.addstr(i, 0, item)
-            if view.screen_selected_line() is not None:
-                win.addstr(
-                    view.screen_selected_line(),
-                    0,
-                    view.selected_item(),
-                    curses.A_REVERSE,
-                )
+            selected_line = view.screen_selected_line()
+            for i, (item, positions) in enumerate(view.screen_highlights()):
+                attr = curses.A_REVERSE if i == selected_line else curses.A_NORMAL
+                win.addstr(i, 0, item, attr)
+                win.highlight(i, 0, item, positions, attr | self.highlight_attr)
+        # Update preview:
+        if self.win.preview:
+            self.show_preview(view)
         # Update input:
         with winfocus(self.win.input) as win:
             win.erase()
@@ -189,35 +274,150 @@ class UiCursesBase:
         # Refresh screen:
         curses.doupdate()
 
-    def input_read(self, nodelay):
-        self.win.input.win.nodelay(nodelay)
+    def show_preview(self, view):
+        with winfocus(self.win.preview) as win:
+            win.erase()
+            item = view.selected_item()
+            if item is None:
+                return
+            preview = self.previewer.get(item)
+            if preview is None:
+                win.addstr(0, 0, "...")
+                return
+            for i, line in enumerate(preview.splitlines()[: win.height]):
+                line = "".join(c for c in line.expandtabs() if c.isprintable())
+                # Avoid the last column, curses fails to write there:
+                win.addstr(i, 0, line[: win.width - 1])
+
+    def input_timeout(self, timeout):
+        """Sets the getch timeout, only if it changed"""
+        if timeout != self.timeout:
+            self.win.input.win.timeout(timeout)
+            self.timeout = timeout
+
+    def input_read(self, timeout):
+        """
+        Reads all keys available, waiting for up to timeout ms for the first
+        one; blocks if timeout is negative.
+
+        Returns the list of raw keys read.
+        """
+        self.input_timeout(timeout)
         key = self.win.input.win.getch()
         if key == -1:
-            return key, None
-        if key in {curses.KEY_ENTER, 10, 13}:
-            return curses.KEY_ENTER, b"KEY_ENTER"
-        if key == 127:
-            return curses.KEY_BACKSPACE, b"KEY_BACKSPACE"
-        keyname = curses.keyname(key)
-        if key == 27:  # ESC
-            self.win.input.win.nodelay(True)
-            k = self.win.input.win.getch()
-            if k != -1:
-                keyname += curses.keyname(k)
-        logger.debug(f"key {key} name {keyname}")
-        return key, keyname
+            return []
+        keys = [key]
+        self.input_timeout(0)
+        while True:
+            key = self.win.input.win.getch()
+            if key == -1:
+                return keys
+            keys.append(key)
+
+    def input_decode(self, keys):
+        """
+        Decodes the raw keys into a list of events, which are either strings
+        with runs of typed or pasted text, or (key, keyname) tuples.
+        """
+        events = []
+        text = bytearray()
+        keys = self.keys_pending + keys
+        self.keys_pending = []
+        i = 0
+        while i < len(keys):
+            if self.pasting:
+                end = find(keys, PASTE_END, i)
+                if end == len(keys):
+                    # The paste continues in the next read:
+                    end -= find_partial(keys, PASTE_END, i)
+                    self.keys_pending = keys[end:]
+                else:
+                    self.pasting = False
+                text.extend(k if k >= 32 else 32 for k in keys[i:end] if k < 256)
+                i = end + len(PASTE_END)
+                continue
+            key = keys[i]
+            i += 1
+            if key == 27 and keys[i : i + 5] == PASTE_START[1:]:
+                self.pasting = True
+                i += 5
+                continue
+            if 32 <= key < 256 and key != 127:
+                if (
+                    not self.edit_actions
+                    or curses.keyname(key) not in self.edit_actions
+                ):
+                    # Bytes are collected so that utf-8 is decoded:
+                    text.append(key)
+                    continue
+            if text:
+                events.append(text_printable(text))
+                text = bytearray()
+            if key in {curses.KEY_ENTER, 10, 13}:
+                events.append((curses.KEY_ENTER, b"KEY_ENTER"))
+                continue
+            if key == 127:
+                events.append((curses.KEY_BACKSPACE, b"KEY_BACKSPACE"))
+                continue
+            keyname = curses.keyname(key)
+            if key == 27 and i < len(keys):  # ESC
+                keyname += curses.keyname(keys[i])
+                i += 1
+            logger.debug(f"key {key} name {keyname}")
+            events.append((key, keyname))
+        if text:
+            events.append(text_printable(text))
+        return events
 
     def interact(self, view):
-        # Generate first item:
-        view.item_generate()
-        # Set nonblocking if we have more items to generate, otherwise
-        # set blocking mode:
-        key, keyname = self.input_read(bool(view.item_generator))
-        return self.input_process(view, key, keyname)
+        # Generate a batch of items:
+        generated = view.items_generate(GENERATE_TIME)
+        # Don't block if we have more items to generate, but don't spin
+        # either if the generator has nothing for us right now:
+        if generated:
+            timeout = 0
+        elif view.item_generator or (self.previewer and self.previewer.busy()):
+            timeout = GENERATOR_WAIT_MS
+        else:
+            timeout = -1
+        keys = self.input_read(timeout)
+        return self.keys_process(view, keys)
+
+    def keys_process(self, view, keys):
+        """Processes the raw keys read; returns True if the view is done"""
+        for event in self.input_decode(keys):
+            if isinstance(event, str):
+                # A whole run of text is a single edit:
+                if event:
+                    view.typed(event)
+            elif self.input_process(view, *event):
+                return True
+        return False
+
+    def resize(self):
+        """Rebuilds the layout after the terminal was resized"""
+        curses.update_lines_cols()
+        self.stdscr.erase()
+        self.stdscr.noutrefresh()
+        self.layout()
+        # The input window is new, with the default timeout:
+        self.timeout = None
+
+    def terminal_resized(self):
+        """
+        Resizes curses to the terminal and rebuilds the layout; for when we
+        handle SIGWINCH instead of curses.
+        """
+        columns, lines = os.get_terminal_size(1)
+        curses.resizeterm(lines, columns)
+        self.resize()
 
     def input_process(self, view, key, keyname):
         if key == -1:
             return False
+        if key == curses.KEY_RESIZE:
+            self.resize()
+            return False
         # Check if it's a custom edit_action
         action = self.edit_actions.get(keyname)
         if action:
@@ -246,6 +446,11 @@ class UiCursesSimple(UiCursesBase):
     menu-----------------------------
     |||||||||||||||||||||||||||||||||
     |||||||||||||||||||||||||||||||||
+
+    With a previewer, the menu is split:
+
+    menu------------ preview---------
+    |||||||||||||||| ||||||||||||||||
     """
 
     def layout(self):
@@ -260,26 +465,20 @@ class UiCursesSimple(UiCursesBase):
             win.win.keypad(True)
             self.win.input = win
         menulines = lines - 2
-        self.win.menu = CursesWin("menu", menulines, cols, 2, 0)
+        if not self.previewer:
+            self.win.menu = CursesWin("menu", menulines, cols, 2, 0)
+            return
+        menucols = cols // 2
+        self.win.menu = CursesWin("menu", menulines, menucols, 2, 0)
+        previewcols = cols - menucols - 1
+        self.win.preview = CursesWin("preview", menulines, previewcols, 2, menucols + 1)
 
 
 @contextmanager
-def context(uiclass=UiCursesSimple):
-    ui = uiclass()
+def context(uiclass=UiCursesSimple, **kwargs):
+    ui = uiclass(**kwargs)
     try:
         ui.start()
         yield ui
     finally:
         ui.end()
-
-
-def main():
-    with context() as ui:
-        items = [str(i) * 10 for i in range(0, ui.max_items())]
-        ui.set("> ", items)
-        ui.refresh()
-        ui.getkey()
-
-
-if __name__ == "__main__":
-    main()
@@ -7,27 +7,72 @@ necessarily the current view, but it can be so by using the Screen
 instance.
 """
 
+import collections
+import collections.abc as abc
+import sys
+import time
+
 import tuzue.binput
+import tuzue.query
+import tuzue.rank
+
+# Seconds items_generate_all waits for a generator that has no item yet:
+PENDING_WAIT = 0.01
 
 
 class View:
-    def __init__(self, title="", items=None, generator=None):
+    def __init__(
+        self,
+        title="",
+        items=None,
+        generator=None,
+        max_items=None,
+        max_bytes=None,
+        rank=None,
+    ):
         # One of the mutually-exclusive arguments must be provided:
         assert (items is None) != (generator is None)
+        # Number of best matches kept on top of items, if ranking:
+        self.rank = rank
+        # Limits on items_all, if bounded; the oldest items are evicted:
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.bounded = max_items is not None or max_bytes is not None
+        # Eviction needs items in the order of items_all:
+        assert not (self.bounded and rank)
+        # Memory used by items_all, when max_bytes is set:
+        self.items_bytes = 0
         # All items:
         self.items_all = items or []
-        # item_generator, when in use:
+        if not isinstance(self.items_all, abc.Sequence):
+            # Mappings and other iterables, we show their keys or items:
+            self.items_all = list(self.items_all)
+        if self.bounded:
+            self.items_all = collections.deque(self.items_all)
+        if max_bytes is not None:
+            self.items_bytes = sum(map(sys.getsizeof, self.items_all))
+        # item_generator, when in use; it can yield None when it has no
+        # item available yet but is not done:
         self.item_generator = generator
         # Effective items, filtered by input:
         self.items = []
+        self.items_evict()
         # Selected item, identified by items index:
         self.selected_idx = None
+        # True if the user moved the selection, which then stays on its
+        # item while ranking; otherwise it stays on the best match:
+        self.selected_moved = False
         # Screen height, or number of visible items:
         self.screen_height = None
         # Screen starts at this self.item idx:
         self.screen_idx = None
         # Self-managed input object:
         self.binput = tuzue.binput.Binput()
+        # Query compiled from the input:
+        self.query = tuzue.query.Query()
+        # Matched positions of the items in the screen, for self.query:
+        self.highlights = {}
+        self.highlights_query = self.query
         # Title, shown in header:
         self.title = title
         # Reset to sync selected_idx with items:
@@ -38,10 +83,25 @@ class View:
         Reset self.items to self.items_all, as if we had no filter input.
         Reset selected_idx.
         """
-        self.items = list(self.items_all) or []
+        self.items = self.items_unfiltered()
         self.selected_idx = 0 if self.items else None
+        self.selected_moved = False
         self.screen_idx = 0 if self.screen_height else None
 
+    def items_new(self, items):
+        """Returns a new container for items, with the type we use"""
+        if self.rank and not self.query.empty():
+            return tuzue.rank.RankedItems(self.rank, self.query.score, items)
+        if self.bounded:
+            return collections.deque(items)
+        return list(items)
+
+    def items_unfiltered(self):
+        if self.item_generator is None:
+            # Nothing gets appended to items_all, we can share it:
+            return self.items_all
+        return self.items_new(self.items_all)
+
     # Item generation methods:
 
     def item_generate(self):
@@ -55,45 +115,120 @@ class View:
         if not self.item_generator:
             return False
         try:
-            wasempty = self.items == []
+            wasempty = not self.items
             item = next(self.item_generator)
+            if item is None:
+                return False
             self.items_all.append(item)
+            if self.max_bytes is not None:
+                self.items_bytes += sys.getsizeof(item)
             if self.item_filter(item):
-                self.items.append(item)
+                pos = self.items.append(item)
+                if pos is not None and self.selected_moved:
+                    self.item_ranked(pos)
                 if self.selected_idx is None and wasempty:
                     self.selected_idx = 0
+            if self.bounded:
+                self.items_evict()
             return True
         except StopIteration:
             self.item_generator = None
             return False
 
-    def items_generate_all(self):
+    def items_generate(self, timeout):
+        """
+        Generate items for up to timeout seconds, or while the generator has
+        them available.
+
+        Returns the number of items generated.
+        """
+        deadline = time.monotonic() + timeout
+        count = 0
         while self.item_generate():
-            pass
+            count += 1
+            if count % 256 == 0 and time.monotonic() >= deadline:
+                break
+        return count
+
+    def items_generate_all(self):
+        """
+        Generate all items, until the generator is done; when it has no item
+        available yet, wait for it, as it's being fed by another thread.
+        """
+        while self.item_generator:
+            if not self.item_generate() and self.item_generator:
+                time.sleep(PENDING_WAIT)
+
+    def items_over_limit(self):
+        if self.max_items is not None and len(self.items_all) > self.max_items:
+            return True
+        return self.max_bytes is not None and self.items_bytes > self.max_bytes
+
+    def items_evict(self):
+        """Evicts the oldest items from items_all while we are over the limits"""
+        while self.items_all and self.items_over_limit():
+            item = self.items_all.popleft()
+            if self.max_bytes is not None:
+                self.items_bytes -= sys.getsizeof(item)
+            # items preserves the order of items_all, so if the evicted item
+            # passes the filter it's the first one there; and if it doesn't,
+            # no equal item does.
+            if self.items and self.items[0] == item:
+                self.items.popleft()
+                self.item_removed_first()
+
+    def item_removed_first(self):
+        """Keeps selected_idx and screen_idx pointing to the same items after
+        the first item was removed from self.items"""
+        if not self.items:
+            self.selected_idx = None
+        elif self.selected_idx:
+            self.selected_idx -= 1
+        if self.screen_idx:
+            self.screen_idx -= 1
+
+    def item_ranked(self, pos):
+        """Keeps selected_idx pointing to the same item after an item was
+        ranked at pos of self.items, pushing down the ones after it"""
+        self.selected_idx = self.items.shifted(self.selected_idx, pos)
+        if not self.selected_in_screen():
+            self.screen_center()
 
     # Item filtering methods:
 
     def item_filter(self, item):
         """Returns True if the provided item should be shown, given the current input"""
-        return not self.binput.string or self.binput.string in item
+        return self.query.match(item)
 
     def items_update(self):
         """Resets and updates the whole self.items list using the current input;
         also resets selected_idx if necessary"""
         selected_item = None
-        if self.selected_idx is not None:
+        # When ranking, the default selection is the best match:
+        if self.selected_idx is not None and (self.selected_moved or not self.rank):
             selected_item = self.items[self.selected_idx]
-        self.items = []
+        query = self.query
+        if self.binput.string != query.string:
+            query = tuzue.query.Query(self.binput.string)
+        narrows = query.narrows(self.query)
+        self.query = query
+        if query.empty():
+            self.items = self.items_unfiltered()
+        elif narrows:
+            # The current items are a superset of the result:
+            self.items = self.items_new(filter(query.match, self.items))
+        else:
+            self.items = self.items_new(filter(query.match, self.items_all))
         self.selected_idx = None
-        idx = 0
-        for item in self.items_all:
-            if self.item_filter(item):
-                self.items.append(item)
-                if item == selected_item:
-                    self.selected_idx = idx
-                idx += 1
-        if self.selected_idx is None and self.items:
-            self.selected_idx = 0
+        if selected_item is not None:
+            try:
+                self.selected_idx = self.items.index(selected_item)
+            except ValueError:
+                pass
+        if self.selected_idx is None:
+            self.selected_moved = False
+            if self.items:
+                self.selected_idx = 0
         if not self.selected_in_screen():
             self.screen_center()
 
@@ -103,6 +238,7 @@ class View:
         if idx < 0 or idx >= len(self.items):
             return
         self.selected_idx = idx
+        self.selected_moved = True
 
     def selected_item(self):
         if self.selected_idx is not None:
@@ -120,17 +256,42 @@ class View:
     # Screen methods, used to generate the concrete view:
 
     def screen_height_set(self, height):
-        old_screen_height = self.screen_height
+        """Sets the screen height, keeping the filtered items and selection"""
+        if height == self.screen_height:
+            return
         self.screen_height = height
-        if height != old_screen_height:
-            self.reset()
+        if self.screen_idx is None:
+            self.screen_idx = 0
+        # Use the new space if we have items to fill it:
+        self.screen_idx = max(0, min(self.screen_idx, len(self.items) - height))
+        if not self.selected_in_screen():
+            self.screen_center()
 
     def screen_items(self):
         screen_idx = self.screen_idx or 0
-        for line, item in enumerate(self.items[screen_idx:]):
-            if self.screen_height is not None and line >= self.screen_height:
-                break
-            yield item
+        end = len(self.items)
+        if self.screen_height is not None:
+            end = min(end, screen_idx + self.screen_height)
+        for idx in range(screen_idx, end):
+            yield self.items[idx]
+
+    def screen_highlights(self):
+        """
+        Yields the (item, positions) of the screen items, where positions
+        are the ones matched by the query. They are computed only for the
+        screen items, and cached while these stay in the screen.
+        """
+        if self.highlights_query is not self.query:
+            self.highlights = {}
+            self.highlights_query = self.query
+        highlights = {}
+        for item in self.screen_items():
+            positions = self.highlights.get(item)
+            if positions is None:
+                positions = self.query.positions(item)
+            highlights[item] = positions
+            yield item, positions
+        self.highlights = highlights
 
     def screen_selected_line(self):
         if self.selected_idx is None:
@@ -150,8 +311,8 @@ class View:
 
     # Key reactors:
 
-    def typed(self, char):
-        self.binput.typed(char)
+    def typed(self, chars):
+        self.binput.typed(chars)
         self.items_update()
 
     def key_enter(self, key=None, keyname=None):
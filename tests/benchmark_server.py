@@ -0,0 +1,81 @@
+# Copyright (C) 2023 Leandro Lisboa Penz <lpenz@lpenz.org>
+# This file is subject to the terms and conditions defined in
+# file 'LICENSE', which is part of this source code package.
+"""
+Benchmark of the throughput and latency of concurrent clients of
+tuzue.server, each typing a sequence of queries like a picker would.
+
+Run it with: python tests/benchmark_server.py
+"""
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+import tuzue.server
+
+QUERIES = ["1", "12", "123", "1234", "9", "98", "987", "item 5"]
+
+
+def client_run(path, prefix, latencies, lock):
+    client = tuzue.server.Client(path)
+    mine = []
+    for query in QUERIES:
+        start = time.perf_counter()
+        client.filter(prefix + query)
+        mine.append(time.perf_counter() - start)
+    client.close()
+    with lock:
+        latencies.extend(mine)
+
+
+def benchmark(path, nclients):
+    latencies = []
+    lock = threading.Lock()
+    threads = [
+        threading.Thread(target=client_run, args=(path, str(n), latencies, lock))
+        for n in range(nclients)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return (
+        len(latencies) / elapsed,
+        latencies[len(latencies) // 2],
+        latencies[len(latencies) * 99 // 100],
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--items", type=int, default=100000)
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    args = parser.parse_args()
+    items = ["item %d" % i for i in range(0, args.items)]
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "tuzue.sock")
+        with tuzue.server.Server(path, items) as server:
+            thread = threading.Thread(target=server.serve_forever)
+            thread.start()
+            try:
+                for nclients in args.clients:
+                    # Each round starts with cold query results:
+                    server.index.results.clear()
+                    throughput, p50, p99 = benchmark(path, nclients)
+                    print(
+                        "%3d clients: %6.0f queries/s, p50 %7.2fms, p99 %7.2fms"
+                        % (nclients, throughput, p50 * 1000, p99 * 1000)
+                    )
+            finally:
+                server.shutdown()
+                thread.join()
+
+
+if __name__ == "__main__":
+    main()
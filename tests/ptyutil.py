@@ -0,0 +1,35 @@
+# Copyright (C) 2023 Leandro Lisboa Penz <lpenz@lpenz.org>
+# This file is subject to the terms and conditions defined in
+# file 'LICENSE', which is part of this source code package.
+"""
+Helpers for the tests that need curses, which requires a terminal
+"""
+
+import os
+from contextlib import contextmanager
+
+
+@contextmanager
+def stdio_pty():
+    """
+    Points stdin and stdout to a new pty, with an xterm TERM; yields the
+    master fd, that gets what curses writes and provides the keys.
+    """
+    master, slave = os.openpty()
+    stdio = os.dup(0), os.dup(1)
+    term = os.environ.get("TERM")
+    os.environ["TERM"] = "xterm"
+    os.dup2(slave, 0)
+    os.dup2(slave, 1)
+    os.close(slave)
+    try:
+        yield master
+    finally:
+        for fd, saved in enumerate(stdio):
+            os.dup2(saved, fd)
+            os.close(saved)
+        os.close(master)
+        if term is None:
+            del os.environ["TERM"]
+        else:
+            os.environ["TERM"] = term
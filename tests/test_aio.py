@@ -0,0 +1,211 @@
+# Copyright (C) 2023 Leandro Lisboa Penz <lpenz@lpenz.org>
+# This file is subject to the terms and conditions defined in
+# file 'LICENSE', which is part of this source code package.
+
+import asyncio
+import os
+import signal
+import unittest
+
+from ptyutil import stdio_pty
+
+import tuzue.aio
+import tuzue.view
+
+
+async def aitems(count):
+    for i in range(0, count):
+        await asyncio.sleep(0)
+        yield str(i)
+
+
+class TestAio(unittest.TestCase):
+    def test_source(self):
+        async def run():
+            source = tuzue.aio.AsyncSource(aitems(20))
+            view = tuzue.view.View(generator=source.generator())
+            view.typed("1")
+            task = asyncio.ensure_future(source.run())
+            while view.item_generator:
+                if not view.items_generate(1):
+                    await source.ready.wait()
+            await task
+            return view
+
+        view = asyncio.run(run())
+        self.assertEqual(list(view.items_all), [str(i) for i in range(0, 20)])
+        self.assertEqual(view.items, ["1"] + ["1%d" % i for i in range(0, 10)])
+
+
+class FakeUi:
+    """Reads keys from a pipe: "q" selects, "j" goes down, others are typed"""
+
+    previewer = None
+
+    def __init__(self, fd):
+        self.fd = fd
+        self.shown = 0
+        self.resized = 0
+
+    def terminal_resized(self):
+        self.resized += 1
+
+    def show(self, view):
+        self.shown += 1
+
+    def input_read(self, timeout):
+        return list(os.read(self.fd, 1024).decode())
+
+    def keys_process(self, view, keys):
+        for key in keys:
+            if key == "q":
+                return True
+            if key == "j":
+                view.key_down()
+            else:
+                view.typed(key)
+        return False
+
+
+class TestNavigator(unittest.TestCase):
+    def setUp(self):
+        self.rfd, self.wfd = os.pipe()
+
+    def tearDown(self):
+        os.close(self.rfd)
+        os.close(self.wfd)
+
+    def navigate(self, view, keys):
+        """
+        Runs a Navigator that gets the keys with a delay between them, along
+        with a ticker coroutine; returns the result, the ticks and the ui.
+        """
+        ui = FakeUi(self.rfd)
+        ticks = []
+
+        async def ticker():
+            while True:
+                ticks.append(None)
+                await asyncio.sleep(0.001)
+
+        async def typer():
+            for key in keys:
+                await asyncio.sleep(0.02)
+                os.write(self.wfd, key.encode())
+
+        async def run():
+            navigator = tuzue.aio.Navigator(ui, view, input_fd=self.rfd)
+            tasks = [asyncio.ensure_future(ticker()), asyncio.ensure_future(typer())]
+            try:
+                return await navigator.run()
+            finally:
+                for task in tasks:
+                    task.cancel()
+
+        return asyncio.run(run()), ticks, ui
+
+    def test_navigator(self):
+        view = tuzue.view.View(items=[str(i) for i in range(0, 100)])
+        result, ticks, ui = self.navigate(view, ["9", "j", "q"])
+        self.assertEqual(result, "19")
+        self.assertEqual(view.items, [str(i) for i in range(0, 100) if "9" in str(i)])
+        # The ticker runs while the menu waits for keys:
+        self.assertGreater(len(ticks), 10)
+        # Initial render, the one after generating, and one per key that
+        # didn't finish:
+        self.assertEqual(ui.shown, 4)
+
+    def test_render_coalesce(self):
+        async def run():
+            ui = FakeUi(self.rfd)
+            view = tuzue.view.View(items=["a"])
+            navigator = tuzue.aio.Navigator(ui, view, input_fd=self.rfd)
+            for _ in range(0, 5):
+                navigator.render_schedule()
+            await asyncio.sleep(0)
+            return ui.shown
+
+        self.assertEqual(asyncio.run(run()), 1)
+
+    def test_source(self):
+        closed = []
+
+        async def endless():
+            try:
+                i = 0
+                while True:
+                    await asyncio.sleep(0.001)
+                    yield str(i)
+                    i += 1
+            finally:
+                closed.append(True)
+
+        async def run():
+            ui = FakeUi(self.rfd)
+            source = tuzue.aio.AsyncSource(endless())
+            view = tuzue.view.View(generator=source.generator())
+            navigator = tuzue.aio.Navigator(ui, view, source, input_fd=self.rfd)
+
+            async def typer():
+                # Wait until the matching items arrived:
+                while len(view.items_all) < 30:
+                    await asyncio.sleep(0.01)
+                os.write(self.wfd, b"2jq")
+
+            task = asyncio.ensure_future(typer())
+            result = await navigator.run()
+            await task
+            return result, view
+
+        result, view = asyncio.run(run())
+        self.assertEqual(result, "12")
+        self.assertGreaterEqual(len(view.items_all), 30)
+        # The source is cancelled when the menu is done:
+        self.assertEqual(closed, [True])
+
+    def test_source_error(self):
+        async def failing():
+            yield "a"
+            yield "b"
+            raise RuntimeError("source failed")
+
+        async def run():
+            ui = FakeUi(self.rfd)
+            source = tuzue.aio.AsyncSource(failing())
+            view = tuzue.view.View(generator=source.generator())
+            navigator = tuzue.aio.Navigator(ui, view, source, input_fd=self.rfd)
+            return await navigator.run()
+
+        with self.assertRaisesRegex(RuntimeError, "source failed"):
+            asyncio.run(run())
+
+    def test_resize(self):
+        async def run():
+            ui = FakeUi(self.rfd)
+            view = tuzue.view.View(items=["a"])
+            navigator = tuzue.aio.Navigator(ui, view, input_fd=self.rfd)
+            loop = asyncio.get_running_loop()
+            loop.call_later(0.01, os.kill, os.getpid(), signal.SIGWINCH)
+            loop.call_later(0.05, os.write, self.wfd, b"q")
+            await navigator.run()
+            return ui
+
+        ui = asyncio.run(run())
+        self.assertEqual(ui.resized, 1)
+
+
+class TestNavigateAsync(unittest.TestCase):
+    def test_navigate_async(self):
+        async def run(master):
+            loop = asyncio.get_running_loop()
+            # Keep the pty from filling up with the curses output:
+            loop.add_reader(master, os.read, master, 65536)
+            loop.call_later(0.1, os.write, master, b"1\x1bOB\r")
+            try:
+                return await tuzue.navigate_async([str(i) for i in range(0, 20)])
+            finally:
+                loop.remove_reader(master)
+
+        with stdio_pty() as master:
+            result = asyncio.run(run(master))
+        self.assertEqual(result, "10")
@@ -96,3 +96,10 @@ class TestInput(unittest.TestCase):
         binput.pos = 8
         binput.key_killwordleft()
         self.assertEqual(binput.string, "asdf v 1234")
+
+    def test_typed_run(self):
+        binput = tuzue.binput.Binput("ad")
+        binput.key_left()
+        binput.typed("bc")
+        self.assertEqual(binput.string, "abcd")
+        self.assertEqual(binput.pos, 3)
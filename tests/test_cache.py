@@ -0,0 +1,101 @@
+# Copyright (C) 2023 Leandro Lisboa Penz <lpenz@lpenz.org>
+# This file is subject to the terms and conditions defined in
+# file 'LICENSE', which is part of this source code package.
+
+import os
+import tempfile
+import unittest
+
+import tuzue
+import tuzue.cache
+import tuzue.view
+
+
+class TestCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache = tuzue.cache.Cache(self.tmpdir.name)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_roundtrip(self):
+        itemlist = [str(i) for i in range(0, 20)] + ["", "çãõ"]
+        self.assertEqual(self.cache.load("k"), None)
+        self.cache.store("k", itemlist)
+        store = self.cache.load("k")
+        self.assertEqual(len(store), len(itemlist))
+        self.assertEqual(store[3], "3")
+        self.assertEqual(store[-1], "çãõ")
+        self.assertEqual(store[1:4], ["1", "2", "3"])
+        self.assertEqual(list(store), itemlist)
+        self.assertEqual(self.cache.load("other"), None)
+
+    def test_newlines(self):
+        itemlist = ["a\nb", "c", "d\n"]
+        store = self.cache.store("k", itemlist)
+        self.assertEqual(store[0], "a\nb")
+        self.assertEqual(list(store), itemlist)
+
+    def test_empty(self):
+        store = self.cache.store("k", [])
+        self.assertEqual(len(store), 0)
+        self.assertEqual(list(store), [])
+
+    def test_items_loader(self):
+        calls = []
+
+        def loader():
+            calls.append(1)
+            return ["a", "b"]
+
+        self.assertEqual(list(self.cache.items("k", loader)), ["a", "b"])
+        self.assertEqual(list(self.cache.items("k", loader)), ["a", "b"])
+        self.assertEqual(len(calls), 1)
+
+    def test_surrogateescape(self):
+        itemlist = [b"a\xffb".decode(errors="surrogateescape"), "c"]
+        self.cache.store("k", itemlist)
+        store = self.cache.load("k")
+        self.assertEqual(store[0], itemlist[0])
+        self.assertEqual(list(store), itemlist)
+
+    def test_truncated(self):
+        self.cache.store("k", [str(i) for i in range(0, 100)])
+        filename = self.cache.filename("k")
+        for size in [1000, 200, 30]:
+            os.truncate(filename, size)
+            self.assertEqual(self.cache.load("k"), None)
+
+    def test_version(self):
+        self.cache.store("k", ["a"])
+        filename = self.cache.filename("k")
+        with open(filename, "r+b") as fd:
+            fd.seek(8)
+            fd.write(b"\xff")
+        self.assertEqual(self.cache.load("k"), None)
+
+    def test_file_key(self):
+        filename = os.path.join(self.tmpdir.name, "data.txt")
+        with open(filename, "w") as fd:
+            fd.write("a\n")
+        key1 = tuzue.cache.file_key(filename)
+        with open(filename, "a") as fd:
+            fd.write("b\n")
+        self.assertNotEqual(key1, tuzue.cache.file_key(filename))
+
+    def test_view(self):
+        itemlist = [str(i) for i in range(0, 20)]
+        view = tuzue.view.View(items=self.cache.store("k", itemlist))
+        view.screen_height_set(3)
+        self.assertEqual(list(view.screen_items()), ["0", "1", "2"])
+        view.typed("1")
+        self.assertEqual(list(view.screen_items()), ["1", "10", "11"])
+
+    def test_navigate_arguments(self):
+        with self.assertRaises(ValueError):
+            tuzue.navigate(["a"], cache_dir=self.tmpdir.name)
+        with self.assertRaises(ValueError):
+            tuzue.navigate(
+                generator=iter(["a"]), cache_dir=self.tmpdir.name, cache_key="k"
+            )
@@ -0,0 +1,29 @@
+# Copyright (C) 2023 Leandro Lisboa Penz <lpenz@lpenz.org>
+# This file is subject to the terms and conditions defined in
+# file 'LICENSE', which is part of this source code package.
+
+import io
+import subprocess
+import sys
+import unittest
+
+import tuzue.cli
+
+
+class TestCli(unittest.TestCase):
+    def test_filter_main(self):
+        instream = io.BytesIO("".join("%d\n" % i for i in range(0, 200)).encode())
+        outstream = io.StringIO()
+        tuzue.cli.filter_main("^19", instream, outstream)
+        self.assertEqual(
+            outstream.getvalue(), "19\n" + "".join("19%d\n" % i for i in range(10))
+        )
+
+    def test_filter_process(self):
+        proc = subprocess.run(
+            [sys.executable, "-m", "tuzue", "--filter", "b !c"],
+            input=b"ab\nbc\n\xffb\n",
+            stdout=subprocess.PIPE,
+            check=True,
+        )
+        self.assertEqual(proc.stdout, b"ab\n\xffb\n")
@@ -0,0 +1,46 @@
+# Copyright (C) 2023 Leandro Lisboa Penz <lpenz@lpenz.org>
+# This file is subject to the terms and conditions defined in
+# file 'LICENSE', which is part of this source code package.
+
+import subprocess
+import sys
+import unittest
+
+# Cumulative "import tuzue" time budget, in microseconds:
+IMPORT_BUDGET_US = 20000
+
+
+def python(*args):
+    proc = subprocess.run(
+        [sys.executable] + list(args),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+    return proc.stdout, proc.stderr
+
+
+class TestImport(unittest.TestCase):
+    def test_lazy(self):
+        code = "import sys, tuzue; print(' '.join(sorted(sys.modules)))"
+        modules = python("-c", code)[0].split()
+        for module in ["curses", "importlib.metadata", "tuzue.ui", "tuzue.view"]:
+            self.assertNotIn(module, modules)
+        code = "import sys, tuzue; tuzue.view; print(' '.join(sorted(sys.modules)))"
+        modules = python("-c", code)[0].split()
+        self.assertIn("tuzue.view", modules)
+        self.assertNotIn("curses", modules)
+
+    def test_import_time(self):
+        # Take the best of a few runs to reduce the noise:
+        best = None
+        for _ in range(3):
+            stderr = python("-X", "importtime", "-c", "import tuzue")[1]
+            for line in stderr.splitlines():
+                fields = [f.strip() for f in line.split("|")]
+                if fields[-1] == "tuzue":
+                    cumulative = int(fields[1])
+                    best = cumulative if best is None else min(best, cumulative)
+        self.assertIsNotNone(best)
+        self.assertLess(best, IMPORT_BUDGET_US)
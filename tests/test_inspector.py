@@ -0,0 +1,58 @@
+# Copyright (C) 2023 Leandro Lisboa Penz <lpenz@lpenz.org>
+# This file is subject to the terms and conditions defined in
+# file 'LICENSE', which is part of this source code package.
+
+import unittest
+
+import tuzue.inspector
+import tuzue.view
+
+
+class Node:
+    def __init__(self, name, children=()):
+        self.name = name
+        self.children = list(children)
+
+
+class TestInspector(unittest.TestCase):
+    def deep_view(self, obj, **kwargs):
+        objdict = {}
+        generator = tuzue.inspector.deep_generator(obj, objdict, **kwargs)
+        view = tuzue.view.View(generator=generator)
+        return view, objdict
+
+    def test_deep_search(self):
+        leaf = Node("needle")
+        state = {"a": [Node("x", [leaf])], "b": {"c": 1}}
+        view, objdict = self.deep_view(state)
+        view.typed("needle")
+        view.items_generate_all()
+        self.assertEqual(view.items, ["['a'][0].children[0].name = 'needle'"])
+        path, value = objdict[view.items[0]]
+        self.assertEqual(path, ["['a']", "[0]", ".children", "[0]", ".name"])
+        self.assertEqual(value, "needle")
+        # Breadth-first:
+        paths = [i.split(" = ")[0] for i in view.items_all]
+        self.assertEqual(paths[:5], ["..", "['a']", "['b']", "['a'][0]", "['b']['c']"])
+
+    def test_deep_search_cycle(self):
+        node = Node("loop")
+        node.children.append(node)
+        view, objdict = self.deep_view(node)
+        view.items_generate_all()
+        paths = [i.split(" = ")[0] for i in view.items_all]
+        self.assertEqual(paths, ["..", ".children", ".name", ".children[0]"])
+
+    def test_deep_search_limits(self):
+        chain = Node("0")
+        for i in range(1, 20):
+            chain = Node(str(i), [chain])
+        view, _ = self.deep_view(chain, max_depth=3)
+        view.items_generate_all()
+        self.assertEqual(max(i.count(".children[0]") for i in view.items_all), 1)
+        view, _ = self.deep_view(chain, max_nodes=5)
+        view.items_generate_all()
+        self.assertEqual(len(view.items_all), 6)
+        view, _ = self.deep_view(chain, time_limit=0)
+        view.items_generate_all()
+        self.assertEqual(view.items_all, [".."])
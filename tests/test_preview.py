@@ -0,0 +1,60 @@
+# Copyright (C) 2023 Leandro Lisboa Penz <lpenz@lpenz.org>
+# This file is subject to the terms and conditions defined in
+# file 'LICENSE', which is part of this source code package.
+
+import threading
+import unittest
+
+import tuzue.preview
+
+
+class TestPreview(unittest.TestCase):
+    def test_cache(self):
+        calls = []
+
+        def callback(item):
+            calls.append(item)
+            return item.upper()
+
+        previewer = tuzue.preview.Previewer(callback, cache_size=2)
+        self.assertEqual(previewer.get("a"), None)
+        previewer.pending.result()
+        self.assertEqual(previewer.get("a"), "A")
+        for item in ["b", "c"]:
+            previewer.get(item)
+            previewer.pending.result()
+        self.assertEqual(list(previewer.cache), ["b", "c"])
+        self.assertEqual(previewer.get("c"), "C")
+        self.assertEqual(calls, ["a", "b", "c"])
+        previewer.shutdown()
+
+    def test_cancel(self):
+        release = threading.Event()
+        calls = []
+
+        def callback(item):
+            calls.append(item)
+            release.wait()
+            return item
+
+        previewer = tuzue.preview.Previewer(callback)
+        previewer.get("a")
+        # "b" is queued behind "a", and then cancelled by "c":
+        previewer.get("b")
+        future_b = previewer.pending
+        self.assertEqual(previewer.get("c"), None)
+        self.assertTrue(future_b.cancelled())
+        self.assertTrue(previewer.busy())
+        release.set()
+        previewer.pending.result()
+        self.assertFalse(previewer.busy())
+        self.assertEqual(calls, ["a", "c"])
+        self.assertEqual(previewer.get("c"), "c")
+        previewer.shutdown()
+
+    def test_exception(self):
+        previewer = tuzue.preview.Previewer(lambda item: 1 / 0)
+        previewer.get("a")
+        previewer.pending.result()
+        self.assertIn("ZeroDivisionError", previewer.get("a"))
+        previewer.shutdown()
@@ -0,0 +1,109 @@
+# Copyright (C) 2023 Leandro Lisboa Penz <lpenz@lpenz.org>
+# This file is subject to the terms and conditions defined in
+# file 'LICENSE', which is part of this source code package.
+
+import unittest
+
+import tuzue
+import tuzue.query
+import tuzue.view
+from tuzue.query import EXACT, PREFIX, SUBSTRING, SUFFIX, Query, Term
+
+
+def matches(string, items):
+    return [i for i in items if Query(string).match(i)]
+
+
+class TestQuery(unittest.TestCase):
+    def test_parse(self):
+        self.assertEqual(Term.parse("foo"), Term(SUBSTRING, "foo"))
+        self.assertEqual(Term.parse("^foo"), Term(PREFIX, "foo"))
+        self.assertEqual(Term.parse("foo$"), Term(SUFFIX, "foo"))
+        self.assertEqual(Term.parse("^foo$"), Term(EXACT, "foo"))
+        self.assertEqual(Term.parse("'^foo$"), Term(SUBSTRING, "^foo$"))
+        self.assertEqual(Term.parse("!^foo"), Term(PREFIX, "foo", True))
+        self.assertEqual(Term.parse("!"), None)
+        self.assertEqual(Term.parse("^"), None)
+        self.assertTrue(Query("").empty())
+        self.assertTrue(Query(" ! ^ ").empty())
+
+    def test_match(self):
+        items = ["foo", "foobar", "barfoo", "bar", "baz"]
+        self.assertEqual(matches("", items), items)
+        self.assertEqual(matches("foo", items), ["foo", "foobar", "barfoo"])
+        self.assertEqual(matches("^foo", items), ["foo", "foobar"])
+        self.assertEqual(matches("foo$", items), ["foo", "barfoo"])
+        self.assertEqual(matches("^foo$", items), ["foo"])
+        self.assertEqual(matches("!foo", items), ["bar", "baz"])
+        self.assertEqual(matches("foo bar", items), ["foobar", "barfoo"])
+        self.assertEqual(matches("foo !^bar", items), ["foo", "foobar"])
+        self.assertEqual(matches("^foo | baz", items), ["foo", "foobar", "baz"])
+        self.assertEqual(
+            matches("'ba | ^foo$ !z", items), ["foo", "foobar", "barfoo", "bar"]
+        )
+        self.assertEqual(matches("'o$", ["o$", "o"]), ["o$"])
+
+    def test_selectivity(self):
+        query = Query("!xy a ^abc ^abc$ abcd")
+        self.assertEqual(
+            [group[0] for group in query.groups],
+            [
+                Term(EXACT, "abc"),
+                Term(PREFIX, "abc"),
+                Term(SUBSTRING, "abcd"),
+                Term(SUBSTRING, "a"),
+                Term(SUBSTRING, "xy", True),
+            ],
+        )
+
+    def test_narrows(self):
+        self.assertTrue(Query("fo").narrows(Query("")))
+        self.assertTrue(Query("foo").narrows(Query("fo")))
+        self.assertTrue(Query("^foo").narrows(Query("oo")))
+        self.assertTrue(Query("^foo").narrows(Query("^fo")))
+        self.assertTrue(Query("foo bar").narrows(Query("foo")))
+        self.assertTrue(Query("!fo").narrows(Query("!foo")))
+        self.assertTrue(Query("foo").narrows(Query("foo | bar")))
+        self.assertFalse(Query("").narrows(Query("fo")))
+        self.assertFalse(Query("!foo").narrows(Query("!fo")))
+        self.assertFalse(Query("foo$x").narrows(Query("foo$")))
+        self.assertFalse(Query("fo | bar").narrows(Query("foo")))
+
+    def test_view(self):
+        itemlist = [str(i) for i in range(0, 200)]
+        view = tuzue.view.View(items=itemlist)
+        for c in "1 !0 ^":
+            view.typed(c)
+        self.assertEqual(len(view.items), len(matches("1 !0", itemlist)))
+        view.typed("9")
+        self.assertEqual(view.items, ["91"])
+        view.typed("$")
+        self.assertEqual(view.items, [])
+        view.key_backspace()
+        view.key_backspace()
+        view.key_backspace()
+        self.assertEqual(view.items, matches("1 !0", itemlist))
+
+    def test_filter(self):
+        itemlist = [str(i) for i in range(0, 200)]
+        self.assertEqual(list(tuzue.filter(iter(itemlist), "")), itemlist)
+        self.assertEqual(
+            list(tuzue.filter((i for i in itemlist), "^19")),
+            ["19"] + ["19%d" % i for i in range(0, 10)],
+        )
+
+    def test_filter_batch(self):
+        itemlist = [str(i) for i in range(0, 200)]
+        queries = ["1", "", "19", "1 9", "!1", "^19 | ^5$"]
+        results = tuzue.filter_batch(iter(itemlist), queries)
+        self.assertEqual(results, [matches(q, itemlist) for q in queries])
+
+    def test_positions(self):
+        self.assertEqual(Query("").positions("abc"), [])
+        self.assertEqual(Query("b").positions("abcb"), [1])
+        self.assertEqual(Query("^ab c$ !b").positions("abxc"), [0, 1, 3])
+        self.assertEqual(Query("^abxc$").positions("abxc"), [0, 1, 2, 3])
+        self.assertEqual(Query("x | ab").positions("abxc"), [0, 1, 2])
+        self.assertEqual(Query("ab bx").positions("abxc"), [0, 1, 2])
+        self.assertEqual(Query("c$ | ab").positions("abzz"), [0, 1])
+        self.assertEqual(Query("^c | ab").positions("abzz"), [0, 1])
@@ -0,0 +1,94 @@
+# Copyright (C) 2023 Leandro Lisboa Penz <lpenz@lpenz.org>
+# This file is subject to the terms and conditions defined in
+# file 'LICENSE', which is part of this source code package.
+
+import asyncio
+import unittest
+
+import tuzue
+import tuzue.rank
+import tuzue.view
+from tuzue.query import Query
+
+
+class TestRank(unittest.TestCase):
+    def test_ranked_items(self):
+        ranked = tuzue.rank.RankedItems(3, int, ["5", "3", "8", "1", "3", "9", "0"])
+        self.assertEqual(list(ranked), ["0", "1", "3", "8", "5", "9", "3"])
+        self.assertEqual(len(ranked), 7)
+        self.assertEqual(ranked.unranked(), 4)
+        self.assertEqual(ranked[2], "3")
+        self.assertEqual(ranked[-1], "3")
+        self.assertEqual(ranked.index("3"), 2)
+        self.assertEqual(ranked.index("8"), 3)
+        ranked.append("2")
+        self.assertEqual(list(ranked)[:3], ["0", "1", "2"])
+        with self.assertRaises(ValueError):
+            ranked.index("x")
+
+    def test_score(self):
+        query = Query("ab")
+        self.assertLess(query.score("abc"), query.score("xabc"))
+        self.assertLess(query.score("ab"), query.score("abc"))
+        query = Query("^x | ab !z")
+        self.assertEqual(query.score("xab"), 3)
+
+    def test_view_generator(self):
+        itemlist = ["%dfoo" % i for i in range(100, 0, -1)] + ["foo"]
+        generator = (i for i in itemlist)
+        view = tuzue.view.View(generator=generator, rank=5)
+        view.screen_height_set(3)
+        view.typed("foo")
+        for _ in range(0, 95):
+            view.item_generate()
+        self.assertEqual(list(view.screen_items()), ["9foo", "8foo", "7foo"])
+        # The selection stays on the best match, as the user didn't move it:
+        self.assertEqual(view.selected_item(), "9foo")
+        view.items_generate_all()
+        self.assertEqual(list(view.screen_items()), ["foo", "9foo", "8foo"])
+        self.assertEqual(view.selected_item(), "foo")
+        self.assertEqual(len(view.items), 101)
+        self.assertEqual(view.items.unranked(), 96)
+        view.typed("$")
+        self.assertEqual(list(view.screen_items()), ["foo", "9foo", "8foo"])
+        view.key_backspace()
+        view.key_backspace()
+        view.key_backspace()
+        view.key_backspace()
+        self.assertEqual(view.items, view.items_all)
+
+    def test_shifted(self):
+        ranked = tuzue.rank.RankedItems(3, int, ["5", "3", "8", "9"])
+        self.assertEqual(list(ranked), ["3", "5", "8", "9"])
+        before = list(ranked)
+        pos = ranked.append("4")
+        self.assertEqual(pos, 1)
+        self.assertEqual(list(ranked), ["3", "4", "5", "9", "8"])
+        for idx, item in enumerate(before):
+            self.assertEqual(ranked[ranked.shifted(idx, pos)], item)
+        self.assertEqual(ranked.append("7"), None)
+
+    def test_view_selection(self):
+        itemlist = ["%dfoo" % i for i in range(999, 0, -1)]
+        generator = (i for i in itemlist)
+        view = tuzue.view.View(generator=generator, rank=3)
+        view.screen_height_set(5)
+        view.typed("foo")
+        for _ in range(0, 3):
+            view.item_generate()
+        self.assertEqual(view.selected_item(), "999foo")
+        view.key_down()
+        self.assertEqual(view.selected_item(), "998foo")
+        view.items_generate_all()
+        self.assertEqual(list(view.items)[:3], ["9foo", "8foo", "7foo"])
+        self.assertEqual(view.selected_item(), "998foo")
+        self.assertTrue(view.selected_in_screen())
+        # A moved selection is kept when the query changes:
+        view.typed("$")
+        self.assertEqual(view.selected_item(), "998foo")
+
+    def test_navigate_arguments(self):
+        with self.assertRaises(ValueError):
+            tuzue.navigate(["a"], rank=3, max_items=10)
+        with self.assertRaises(ValueError):
+            asyncio.run(tuzue.navigate_async(["a"], rank=3, max_bytes=10))
@@ -0,0 +1,39 @@
+# Copyright (C) 2023 Leandro Lisboa Penz <lpenz@lpenz.org>
+# This file is subject to the terms and conditions defined in
+# file 'LICENSE', which is part of this source code package.
+
+import io
+import os
+import unittest
+
+import tuzue.reader
+import tuzue.view
+
+
+class TestReader(unittest.TestCase):
+    def test_read_batches(self):
+        stream = io.BytesIO(b"a\nbb\nccc\nd")
+        batches = list(tuzue.reader.read_batches(stream, 3))
+        self.assertEqual(sum(batches, []), ["a", "bb", "ccc", "d"])
+        stream = io.BytesIO(b"a\nb\n")
+        self.assertEqual(list(tuzue.reader.read_batches(stream)), [["a", "b"]])
+
+    def test_read_batches_decoding(self):
+        stream = io.BytesIO("ção\n".encode() + b"\xff\n")
+        batches = list(tuzue.reader.read_batches(stream, 1))
+        self.assertEqual(sum(batches, []), ["ção", "\udcff"])
+
+    def test_reader_view(self):
+        rfd, wfd = os.pipe()
+        reader = tuzue.reader.Reader(os.fdopen(rfd, "rb"))
+        reader.start()
+        view = tuzue.view.View(generator=reader.generator())
+        view.items_generate(0)
+        self.assertTrue(view.item_generator)
+        view.typed("1")
+        with os.fdopen(wfd, "wb") as fd:
+            fd.write(b"".join(b"%d\n" % i for i in range(0, 20)))
+        # Waits for the reader thread:
+        view.items_generate_all()
+        self.assertEqual(view.items, ["1"] + ["1%d" % i for i in range(0, 10)])
+        self.assertEqual(view.item_generator, None)
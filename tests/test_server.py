@@ -0,0 +1,121 @@
+# Copyright (C) 2023 Leandro Lisboa Penz <lpenz@lpenz.org>
+# This file is subject to the terms and conditions defined in
+# file 'LICENSE', which is part of this source code package.
+
+import os
+import socket
+import stat
+import tempfile
+import threading
+import unittest
+
+import tuzue.query
+import tuzue.server
+
+
+class TestServer(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "tuzue.sock")
+        self.items = ["item %d" % i for i in range(0, 100000)]
+        self.server = tuzue.server.Server(self.path, self.items)
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+        self.tmpdir.cleanup()
+
+    def test_socket(self):
+        path = os.path.join(self.tmpdir.name, "shared.sock")
+        # Socket left behind by a server that crashed:
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(path)
+        stale.close()
+        server = tuzue.server.Server(path, [], mode=0o660, group=os.getgid())
+        self.assertEqual(stat.S_IMODE(os.stat(path).st_mode), 0o660)
+        self.assertEqual(os.stat(path).st_gid, os.getgid())
+        server.server_close()
+        # We don't remove the socket of a running server:
+        with self.assertRaises(OSError):
+            tuzue.server.Server(self.path, [])
+
+    def test_filter(self):
+        client = tuzue.server.Client(self.path)
+        total, items = client.filter("^item 99 !5")
+        query = tuzue.query.Query("^item 99 !5")
+        expected = list(tuzue.query.filter_items(self.items, query))
+        self.assertEqual(total, len(expected))
+        self.assertEqual(items, expected[: tuzue.server.PAGE_SIZE])
+        total, items = client.filter("", offset=10, limit=3)
+        self.assertEqual(total, len(self.items))
+        self.assertEqual(items, ["item 10", "item 11", "item 12"])
+        client.close()
+
+    def test_narrow(self):
+        client = tuzue.server.Client(self.path)
+        client.filter("9")
+        client.filter("99")
+        # The second query was filtered from the result of the first:
+        self.assertEqual(list(self.server.index.results), ["9", "99"])
+        total, _ = client.filter("99")
+        self.assertEqual(total, sum(1 for i in self.items if "99" in i))
+        client.close()
+
+    def test_cache_items(self):
+        index = tuzue.server.Index(self.items, cache_items=50000)
+        # Too large to be cached:
+        self.assertEqual(len(index.matches("item")), len(self.items))
+        self.assertEqual(len(index.results), 0)
+        for string in ["1", "2", "12"]:
+            index.matches(string)
+        # "1" was evicted to make room for "2":
+        self.assertEqual(list(index.results), ["2", "12"])
+        self.assertLessEqual(index.results_items, 50000)
+        self.assertEqual(
+            index.results_items, sum(len(r) for _, r in index.results.values())
+        )
+
+    def test_remote_items(self):
+        client = tuzue.server.Client(self.path)
+        items = tuzue.server.RemoteItems(client, "1", max_pages=2)
+        expected = [i for i in self.items if "1" in i]
+        self.assertEqual(len(items), len(expected))
+        self.assertEqual(items[0], expected[0])
+        self.assertEqual(items[1000], expected[1000])
+        self.assertEqual(items[-1], expected[-1])
+        self.assertEqual(len(items.pages), 2)
+        with self.assertRaises(IndexError):
+            items[len(expected)]
+        client.close()
+
+    def test_remote_view(self):
+        client = tuzue.server.Client(self.path)
+        view = tuzue.server.RemoteView(client)
+        view.screen_height_set(10)
+        self.assertEqual(len(view.items), len(self.items))
+        view.typed("4242")
+        self.assertEqual(len(view.items), 20)
+        self.assertEqual(list(view.screen_items())[:2], ["item 4242", "item 14242"])
+        view.key_down()
+        self.assertEqual(view.selected_item(), "item 14242")
+        # The selection is kept while it matches:
+        view.typed("$")
+        self.assertEqual(view.selected_item(), "item 14242")
+        self.assertEqual(view.selected_idx, 1)
+        view.typed("5")
+        self.assertEqual(len(view.items), 0)
+        self.assertEqual(view.selected_item(), None)
+        view.key_backspace()
+        view.key_backspace()
+        self.assertEqual(view.selected_item(), "item 4242")
+        for _ in range(0, 15):
+            view.key_down()
+        self.assertEqual(view.selected_item(), "item 54242")
+        view.key_backspace()
+        self.assertEqual(view.selected_item(), "item 54242")
+        self.assertGreater(view.selected_idx, 15)
+        self.assertTrue(view.selected_in_screen())
+        client.close()
@@ -0,0 +1,104 @@
+# Copyright (C) 2023 Leandro Lisboa Penz <lpenz@lpenz.org>
+# This file is subject to the terms and conditions defined in
+# file 'LICENSE', which is part of this source code package.
+
+import curses
+import unittest
+from contextlib import contextmanager
+
+from ptyutil import stdio_pty
+
+import tuzue.ui.tcurses
+from tuzue.ui.tcurses import PASTE_END, PASTE_START
+
+
+def keys(string):
+    return list(string.encode())
+
+
+@contextmanager
+def curses_pty():
+    """Starts curses on a pty, so that we can use it without a terminal"""
+    with stdio_pty():
+        curses.initscr()
+        try:
+            yield
+        finally:
+            curses.endwin()
+
+
+def decode(*reads):
+    """Decodes each read with a new UI; returns the events and the UI"""
+    ui = tuzue.ui.tcurses.UiCursesSimple()
+    with curses_pty():
+        return [ui.input_decode(keys) for keys in reads], ui
+
+
+class TestInputDecode(unittest.TestCase):
+    def test_run(self):
+        events, _ = decode(keys("ab") + [curses.KEY_DOWN] + keys("c\n"))
+        self.assertEqual(
+            events[0],
+            [
+                "ab",
+                (curses.KEY_DOWN, b"KEY_DOWN"),
+                "c",
+                (curses.KEY_ENTER, b"KEY_ENTER"),
+            ],
+        )
+
+    def test_utf8(self):
+        events, _ = decode(keys("ação"))
+        self.assertEqual(events, [["ação"]])
+
+    def test_paste(self):
+        events, ui = decode(keys("x") + PASTE_START + keys("a\nb") + PASTE_END)
+        self.assertEqual(events, [["xa b"]])
+        self.assertFalse(ui.pasting)
+
+    def test_paste_split(self):
+        events, ui = decode(
+            PASTE_START + keys("abc"),
+            keys("\ndef") + PASTE_END[:3],
+            PASTE_END[3:] + keys("\n"),
+        )
+        self.assertEqual(
+            events, [["abc"], [" def"], [(curses.KEY_ENTER, b"KEY_ENTER")]]
+        )
+        self.assertFalse(ui.pasting)
+        events, ui = decode(PASTE_START + keys("abc"))
+        self.assertTrue(ui.pasting)
+
+    def test_esc(self):
+        events, _ = decode([27] + keys("f") + [27, curses.KEY_BACKSPACE, 27])
+        self.assertEqual(
+            events, [[(27, b"^[f"), (27, b"^[KEY_BACKSPACE"), (27, b"^[")]]
+        )
+
+
+class TestHighlight(unittest.TestCase):
+    def test_runs(self):
+        self.assertEqual(list(tuzue.ui.tcurses.runs([])), [])
+        self.assertEqual(
+            list(tuzue.ui.tcurses.runs([0, 1, 2, 5, 7, 8])), [(0, 3), (5, 1), (7, 2)]
+        )
+
+    def test_highlight(self):
+        with curses_pty():
+            win = tuzue.ui.tcurses.CursesWin("test", 2, 10, 0, 0)
+            win.addstr(0, 0, "abcdef")
+            win.highlight(0, 0, "abcdef", [1, 2, 5], curses.A_BOLD)
+            bold = [bool(win.win.inch(0, c) & curses.A_BOLD) for c in range(0, 10)]
+            self.assertEqual(
+                bold,
+                [False, True, True, False, False, True, False, False, False, False],
+            )
+            # Truncated by addstr, that ends the line with "...":
+            string = "0123456789abc"
+            win.addstr(1, 0, string)
+            win.highlight(1, 0, string, [4, 5, 6, 7, 11], curses.A_BOLD)
+            bold = [bool(win.win.inch(1, c) & curses.A_BOLD) for c in range(0, 10)]
+            self.assertEqual(
+                bold,
+                [False, False, False, False, True, True, False, False, False, False],
+            )
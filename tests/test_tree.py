@@ -0,0 +1,108 @@
+# Copyright (C) 2023 Leandro Lisboa Penz <lpenz@lpenz.org>
+# This file is subject to the terms and conditions defined in
+# file 'LICENSE', which is part of this source code package.
+
+import unittest
+
+import tuzue
+import tuzue.tree
+import tuzue.view
+
+CONFIG = {
+    "server": {"host": "localhost", "ports": [80, 443]},
+    "users": [{"name": "alice"}, {"name": "bob"}],
+    "debug": False,
+    "empty": {},
+}
+
+
+class FakeUi:
+    """Selects the items in the given order"""
+
+    def __init__(self, selections):
+        self.selections = list(selections)
+
+    def show(self, view):
+        pass
+
+    def interact(self, view):
+        view.items_generate_all()
+        view.selected_idx_set(view.items.index(self.selections.pop(0)))
+        return True
+
+
+class TestTree(unittest.TestCase):
+    def test_is_nested(self):
+        self.assertTrue(tuzue.tree.is_nested(CONFIG))
+        self.assertTrue(tuzue.tree.is_nested([[1], [2]]))
+        self.assertFalse(tuzue.tree.is_nested(["a", "b"]))
+        self.assertFalse(tuzue.tree.is_nested([]))
+        self.assertFalse(tuzue.tree.is_nested({"a": "x", "b": 1}))
+        self.assertFalse(tuzue.tree.is_nested({}))
+
+    def test_entries(self):
+        entrydict = {}
+        items = list(tuzue.tree.entries(CONFIG, entrydict))
+        self.assertEqual(
+            items,
+            [
+                "..",
+                "['server'] = {...} (2)",
+                "['users'] = [...] (2)",
+                "['debug'] = False",
+                "['empty'] = {...} (0)",
+            ],
+        )
+        self.assertEqual(entrydict[items[3]], ("debug", False))
+
+    def test_flatten(self):
+        entrydict = {}
+        view = tuzue.view.View(generator=tuzue.tree.flatten(CONFIG, entrydict))
+        view.typed("name")
+        view.items_generate_all()
+        self.assertEqual(
+            view.items,
+            ["['users'][0]['name'] = 'alice'", "['users'][1]['name'] = 'bob'"],
+        )
+        self.assertEqual(entrydict[view.items[1]], (("users", 1, "name"), "bob"))
+        self.assertEqual(len(view.items_all), 7)
+
+    def test_navigate(self):
+        ui = FakeUi(
+            [
+                "['server'] = {...} (2)",
+                "['ports'] = [...] (2)",
+                "..",
+                "..",
+                "['users'] = [...] (2)",
+                "[1] = {...} (1)",
+                "['name'] = 'bob'",
+            ]
+        )
+        result = tuzue.tree.Tree(ui).navigate(CONFIG)
+        self.assertEqual(result, (("users", 1, "name"), "bob"))
+        ui = FakeUi([".."])
+        self.assertEqual(tuzue.tree.Tree(ui).navigate(CONFIG), None)
+
+    def test_search(self):
+        ui = FakeUi(["['server']['ports'][1] = 443"])
+        result = tuzue.tree.Tree(ui).search(CONFIG)
+        self.assertEqual(result, (("server", "ports", 1), 443))
+        ui = FakeUi(["['server']['ports'][1] = 443"])
+        result = tuzue.tree.Tree(ui).search(CONFIG, rank=3)
+        self.assertEqual(result, (("server", "ports", 1), 443))
+
+    def test_navigate_arguments(self):
+        for kwargs in [
+            {"cache_dir": "/tmp", "cache_key": "k"},
+            {"max_items": 10},
+            {"max_bytes": 10},
+            {"rank": 3},
+            {"rank": 3, "flat": True, "max_items": 10},
+            {"generator": iter(["a"])},
+            {"preview": str},
+        ]:
+            with self.assertRaises(ValueError):
+                tuzue.navigate(CONFIG, **kwargs)
+        with self.assertRaises(ValueError):
+            tuzue.navigate(["a", "b"], flat=True)
@@ -2,6 +2,7 @@
 # This file is subject to the terms and conditions defined in
 # file 'LICENSE', which is part of this source code package.
 
+import sys
 import unittest
 
 import tuzue.view
@@ -46,6 +47,13 @@ class TestView(unittest.TestCase):
         self.assertEqual(list(view.screen_items()), [])
         self.assertEqual(view.selected_item(), None)
 
+    def test_typed_run(self):
+        itemlist = [str(i) for i in range(0, 200)]
+        view = tuzue.view.View(items=itemlist)
+        view.typed("19")
+        self.assertEqual(view.binput.string, "19")
+        self.assertEqual(view.items, ["19", "119"] + ["19%d" % i for i in range(10)])
+
     def test_screen(self):
         itemlist = [str(i) for i in range(0, 10)]
         view = tuzue.view.View(items=itemlist)
@@ -130,3 +138,112 @@ class TestView(unittest.TestCase):
         view.key_home()
         self.assertEqual(list(view.screen_items()), ["0", "1", "2"])
         self.assertEqual(view.selected_item(), "0")
+
+    def test_generator_pending(self):
+        def generator():
+            yield "0"
+            yield None
+            yield "1"
+
+        view = tuzue.view.View(generator=generator())
+        self.assertEqual(view.items_generate(1), 1)
+        self.assertEqual(view.items, ["0"])
+        self.assertTrue(view.item_generator)
+        self.assertEqual(view.items_generate(1), 1)
+        self.assertEqual(view.items, ["0", "1"])
+        self.assertEqual(view.items_generate(1), 0)
+        self.assertEqual(view.item_generator, None)
+        view = tuzue.view.View(generator=generator())
+        view.items_generate_all()
+        self.assertEqual(view.items, ["0", "1"])
+        self.assertEqual(view.item_generator, None)
+
+    def test_max_items(self):
+        generator = (str(i) for i in range(0, 20))
+        view = tuzue.view.View(generator=generator, max_items=5)
+        view.screen_height_set(3)
+        view.items_generate_all()
+        self.assertEqual(list(view.items_all), ["15", "16", "17", "18", "19"])
+        self.assertEqual(list(view.screen_items()), ["15", "16", "17"])
+        self.assertEqual(view.selected_item(), "15")
+
+    def test_max_items_filter(self):
+        itemlist = [str(i) for i in range(0, 40)]
+        generator = (i for i in itemlist)
+        view = tuzue.view.View(generator=generator, max_items=10)
+        view.screen_height_set(3)
+        for _ in range(0, 12):
+            view.item_generate()
+        view.typed("1")
+        self.assertEqual(list(view.items), ["10", "11"])
+        view.key_down()
+        self.assertEqual(view.selected_item(), "11")
+        for _ in range(0, 9):
+            view.item_generate()
+        # "10" was evicted; the selection stays on "11":
+        self.assertEqual(list(view.items), ["1%d" % i for i in range(1, 10)])
+        self.assertEqual(view.selected_item(), "11")
+        self.assertEqual(view.screen_selected_line(), 0)
+        view.key_end()
+        view.items_generate_all()
+        self.assertEqual(list(view.items_all), itemlist[-10:])
+        self.assertEqual(list(view.items), ["31"])
+        self.assertEqual(view.selected_item(), "31")
+        self.assertEqual(view.screen_idx, 0)
+        view.key_backspace()
+        self.assertEqual(list(view.items), itemlist[-10:])
+        self.assertEqual(view.selected_item(), "31")
+
+    def test_max_bytes(self):
+        generator = ("%04d" % i for i in range(0, 1000))
+        size = sys.getsizeof("0000")
+        view = tuzue.view.View(generator=generator, max_bytes=size * 10)
+        view.items_generate_all()
+        self.assertEqual(len(view.items_all), 10)
+        self.assertEqual(view.items_all[0], "0990")
+        self.assertEqual(view.items_bytes, size * 10)
+
+    def test_screen_resize(self):
+        itemlist = [str(i) for i in range(0, 100)]
+        view = tuzue.view.View(items=itemlist)
+        view.screen_height_set(5)
+        view.typed("1")
+        for _ in range(0, 10):
+            view.key_down()
+        items = view.items
+        self.assertEqual(view.selected_item(), "19")
+        self.assertEqual(view.screen_idx, 6)
+        view.screen_height_set(3)
+        self.assertIs(view.items, items)
+        self.assertEqual(view.selected_item(), "19")
+        self.assertTrue(view.selected_in_screen())
+        self.assertEqual(view.screen_idx, 9)
+        view.screen_height_set(10)
+        self.assertEqual(view.selected_item(), "19")
+        self.assertEqual(view.screen_idx, 9)
+        view.screen_height_set(30)
+        self.assertEqual(view.screen_idx, 0)
+        self.assertEqual(view.selected_item(), "19")
+        self.assertEqual(view.binput.string, "1")
+
+    def test_screen_highlights(self):
+        itemlist = [str(i) for i in range(0, 200)]
+        view = tuzue.view.View(items=itemlist)
+        view.screen_height_set(3)
+        self.assertEqual(
+            list(view.screen_highlights()), [("0", []), ("1", []), ("2", [])]
+        )
+        view.typed("1")
+        self.assertEqual(
+            list(view.screen_highlights()), [("1", [0]), ("10", [0]), ("11", [0])]
+        )
+        self.assertEqual(sorted(view.highlights), ["1", "10", "11"])
+        view.key_down()
+        view.key_down()
+        view.key_down()
+        self.assertEqual(
+            list(view.screen_highlights()), [("10", [0]), ("11", [0]), ("12", [0])]
+        )
+        self.assertEqual(sorted(view.highlights), ["10", "11", "12"])
+        view.typed("2")
+        self.assertEqual(list(view.screen_highlights())[0], ("12", [0, 1]))